@@ -12,6 +12,7 @@ from juntagrico.admins.job_type_admin import JobTypeAdmin
 from juntagrico.admins.list_message_admin import ListMessageAdmin
 from juntagrico.admins.member_admin import MemberAdmin, MemberAdminWithShares
 from juntagrico.admins.one_time_job_admin import OneTimeJobAdmin
+from juntagrico.admins.outbox_email_admin import OutboxEmailAdmin
 from juntagrico.admins.share_admin import ShareAdmin
 from juntagrico.admins.subscription_admin import SubscriptionAdmin
 from juntagrico.admins.subscription_type_admin import SubscriptionTypeAdmin, SubscriptionSizeAdmin
@@ -22,7 +23,7 @@ from juntagrico.entity.depot import Depot
 from juntagrico.entity.extrasubs import ExtraSubscription, ExtraSubscriptionType, ExtraSubscriptionCategory
 from juntagrico.entity.jobs import Assignment, ActivityArea, JobExtra, JobExtraType, JobType, RecuringJob, OneTimeJob
 from juntagrico.entity.listmessage import ListMessage
-from juntagrico.entity.mailing import MailTemplate
+from juntagrico.entity.mailing import MailTemplate, OutboxEmail
 from juntagrico.entity.member import Member
 from juntagrico.entity.share import Share
 from juntagrico.entity.subs import Subscription
@@ -43,6 +44,7 @@ admin.site.register(Subscription, SubscriptionAdmin)
 admin.site.register(Member, MemberAdminWithShares if Config.enable_shares() else MemberAdmin)
 admin.site.register(ActivityArea, AreaAdmin)
 admin.site.register(MailTemplate)
+admin.site.register(OutboxEmail, OutboxEmailAdmin)
 admin.site.register(Delivery, DeliveryAdmin)
 admin.site.register(JobExtra, BaseAdmin)
 admin.site.register(JobExtraType, BaseAdmin)
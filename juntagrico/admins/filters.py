@@ -1,6 +1,7 @@
 import datetime
 
-from django.contrib.admin.filters import DateFieldListFilter
+from django.contrib.admin.filters import DateFieldListFilter, SimpleListFilter
+from django.db.models import F, Q
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
@@ -21,3 +22,27 @@ class FutureDateTimeFilter(DateFieldListFilter):
                 self.lookup_kwarg_until: str(today + datetime.timedelta(days=7)),
             }),
         ) + self.links[1:]
+
+
+class FreeSlotsFilter(SimpleListFilter):
+    '''
+    filter jobs by their occupied_slots counter
+    '''
+    title = _('Freie Plätze')
+    parameter_name = 'free_slots'
+
+    def lookups(self, request, model_admin):
+        return (
+            ('free', _('Freie Plätze')),
+            ('full', _('Ausgebucht')),
+            ('empty', _('Ohne Teilnehmende')),
+        )
+
+    def queryset(self, request, queryset):
+        if self.value() == 'free':
+            return queryset.filter(Q(infinite_slots=True) | Q(occupied_slots__lt=F('slots')))
+        if self.value() == 'full':
+            return queryset.filter(infinite_slots=False, occupied_slots__gte=F('slots'))
+        if self.value() == 'empty':
+            return queryset.filter(occupied_slots=0)
+        return queryset
@@ -7,6 +7,8 @@ from django.utils.timezone import get_default_timezone as gdtz, localtime, is_na
 from django.utils.translation import gettext as _
 
 from juntagrico.entity.jobs import RecuringJob
+from juntagrico.util.jobs import job_series_dates
+from juntagrico.util.management import create_job_series
 from juntagrico.util.temporal import weekday_choices
 
 
@@ -44,27 +46,17 @@ class JobCopyForm(forms.ModelForm):
     def clean(self):
         cleaned_data = forms.ModelForm.clean(self)
         if 'start_date' in cleaned_data and 'end_date' in cleaned_data:
-            if not self.get_dates(cleaned_data):
+            dates = self.get_dates(cleaned_data)
+            if not dates:
                 raise ValidationError(
                     _('Kein neuer Job fällt zwischen Anfangs- und Enddatum'))
         return cleaned_data
 
     def save(self, commit=True):
-        time = self.cleaned_data['time']
-
         inst = self.instance
+        create_job_series(inst.type, self.get_dates(self.cleaned_data), self.cleaned_data['time'], inst.slots)
 
-        newjobs = []
-        for date in self.get_dates(self.cleaned_data):
-            dt = datetime.datetime.combine(date, time)
-            job = RecuringJob.objects.create(
-                type=inst.type, slots=inst.slots, time=dt)
-            newjobs.append(job)
-            job.save()
-
-        # create new objects
         # HACK: admin expects a saveable object to be returned when commit=False
-        # return newjobs[-1]
         return inst
 
     def save_m2m(self):
@@ -73,17 +65,5 @@ class JobCopyForm(forms.ModelForm):
 
     @staticmethod
     def get_dates(cleaned_data):
-        start = cleaned_data['start_date']
-        end = cleaned_data['end_date']
-        weekdays = cleaned_data['weekdays']
-        weekdays = set(int(i) for i in weekdays)
-        res = []
-        skip_even_weeks = cleaned_data['weekly'] == '14'
-        for delta in range((end - start).days + 1):
-            if skip_even_weeks and delta % 14 >= 7:
-                continue
-            date = start + datetime.timedelta(delta)
-            if not date.isoweekday() in weekdays:
-                continue
-            res.append(date)
-        return res
+        return job_series_dates(cleaned_data['start_date'], cleaned_data['end_date'], cleaned_data['weekdays'],
+                                int(cleaned_data['weekly']))
@@ -1,21 +1,23 @@
 from django.conf.urls import url
 from django.contrib import messages
+from django.contrib.admin import helpers
+from django.core.exceptions import PermissionDenied
 from django.http import HttpResponseRedirect
 from django.utils.translation import gettext as _
 
 from juntagrico.admins import BaseAdmin
-from juntagrico.admins.filters import FutureDateTimeFilter
+from juntagrico.admins.filters import FreeSlotsFilter, FutureDateTimeFilter
 from juntagrico.admins.forms.job_copy_form import JobCopyForm
 from juntagrico.admins.inlines.assignment_inline import AssignmentInline
 from juntagrico.dao.jobtypedao import JobTypeDao
 from juntagrico.entity.jobs import RecuringJob
-from juntagrico.util.admin import formfield_for_coordinator, queryset_for_coordinator, extra_context_for_past_jobs
+from juntagrico.util.admin import formfield_for_coordinator, queryset_for_coordinator, extra_context_for_past_jobs, free_slots, cancel_jobs
 
 
 class JobAdmin(BaseAdmin):
-    list_display = ['__str__', 'type', 'time', 'slots', 'free_slots']
-    list_filter = ('type__activityarea', ('time', FutureDateTimeFilter))
-    actions = ['copy_job', 'mass_copy_job']
+    list_display = ['__str__', 'type', 'time', 'slots', free_slots]
+    list_filter = ('type__activityarea', ('time', FutureDateTimeFilter), FreeSlotsFilter)
+    actions = ['copy_job', 'mass_copy_job', cancel_jobs]
     search_fields = ['type__name', 'type__activityarea__name', 'time']
     exclude = ['reminder_sent']
     inlines = [AssignmentInline]
@@ -57,14 +59,44 @@ class JobAdmin(BaseAdmin):
         # HUGE HACK: modify admin properties just for this view
         tmp_readonly = self.readonly_fields
         tmp_inlines = self.inlines
+        tmp_template = self.change_form_template
         self.readonly_fields = []
         self.inlines = []
-        res = self.change_view(request, jobid, extra_context={
-            'title': 'Copy job'})
-        self.readonly_fields = tmp_readonly
-        self.inlines = tmp_inlines
+        self.change_form_template = 'admin/juntagrico/job_copy_form.html'
+        try:
+            if request.method == 'POST' and '_preview' in request.POST:
+                res = self.copy_job_preview(request, jobid)
+            else:
+                res = self.change_view(request, jobid, extra_context={'title': 'Copy job'})
+        finally:
+            self.readonly_fields = tmp_readonly
+            self.inlines = tmp_inlines
+            self.change_form_template = tmp_template
         return res
 
+    def copy_job_preview(self, request, jobid):
+        '''
+        render the copy form again with the entered values and the dates of the new jobs, without creating them
+        '''
+        job = self.get_object(request, jobid)
+        if job is None or not self.has_change_permission(request, job):
+            raise PermissionDenied
+        form = JobCopyForm(request.POST, instance=job)
+        admin_form = helpers.AdminForm(form, list(self.get_fieldsets(request, job)), {}, model_admin=self)
+        context = {
+            **self.admin_site.each_context(request),
+            'title': 'Copy job',
+            'adminform': admin_form,
+            'object_id': jobid,
+            'original': job,
+            'is_popup': False,
+            'media': self.media + admin_form.media,
+            'inline_admin_formsets': [],
+            'errors': helpers.AdminErrorList(form, []),
+            'preview_dates': form.get_dates(form.cleaned_data) if form.is_valid() else [],
+        }
+        return self.render_change_form(request, context, change=True, obj=job)
+
     def get_queryset(self, request):
         return queryset_for_coordinator(self, request, 'type__activityarea__coordinator')
 
@@ -1,20 +1,20 @@
 from django.utils.translation import gettext as _
 
 from juntagrico.admins import BaseAdmin
-from juntagrico.admins.filters import FutureDateTimeFilter
+from juntagrico.admins.filters import FreeSlotsFilter, FutureDateTimeFilter
 from juntagrico.admins.inlines.assignment_inline import AssignmentInline
 from juntagrico.admins.inlines.job_extra_inline import JobExtraInline
 from juntagrico.dao.activityareadao import ActivityAreaDao
 from juntagrico.dao.assignmentdao import AssignmentDao
 from juntagrico.entity.jobs import JobType, RecuringJob, OneTimeJob
-from juntagrico.util.admin import formfield_for_coordinator, queryset_for_coordinator, extra_context_for_past_jobs
+from juntagrico.util.admin import formfield_for_coordinator, queryset_for_coordinator, extra_context_for_past_jobs, free_slots, cancel_jobs
 from juntagrico.util.models import attribute_copy
 
 
 class OneTimeJobAdmin(BaseAdmin):
-    list_display = ['__str__', 'time', 'slots', 'free_slots']
-    list_filter = ('activityarea', ('time', FutureDateTimeFilter))
-    actions = ['transform_job']
+    list_display = ['__str__', 'time', 'slots', free_slots]
+    list_filter = ('activityarea', ('time', FutureDateTimeFilter), FreeSlotsFilter)
+    actions = ['transform_job', cancel_jobs]
     search_fields = ['name', 'activityarea__name', 'time']
     exclude = ['reminder_sent']
 
@@ -0,0 +1,9 @@
+from juntagrico.admins import BaseAdmin
+
+
+class OutboxEmailAdmin(BaseAdmin):
+    list_display = ['subject', 'recipients', 'created', 'attempts', 'next_attempt', 'failed', 'last_error']
+    list_filter = ['failed']
+    search_fields = ['subject', 'recipients']
+    exclude = ['message']
+    readonly_fields = ['subject', 'recipients', 'created', 'attempts', 'last_error']
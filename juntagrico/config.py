@@ -79,6 +79,8 @@ class Config:
     business_year_start = _get_setting('BUSINESS_YEAR_START', {'day': 1, 'month': 1})
     business_year_cancelation_month = _get_setting('BUSINESS_YEAR_CANCELATION_MONTH', 12)
     membership_end_month = _get_setting('MEMBERSHIP_END_MONTH', 6)
+    menu_cache_timeout = _get_setting('MENU_CACHE_TIMEOUT', 300)
+    query_profile_file = _get_setting('QUERY_PROFILE_FILE')
     cookie_consent = _get_setting_with_key(
         'COOKIE_CONSENT',
         lambda: {
@@ -95,6 +97,8 @@ class Config:
     adminportal_name = _get_setting('ADMINPORTAL_NAME', 'my.juntagrico')
     adminportal_server_url = _get_setting('ADMINPORTAL_SERVER_URL', 'my.juntagrico.juntagrico')
     default_mailer = _get_setting('DEFAULT_MAILER', 'juntagrico.util.defaultmailer.Mailer')
+    outbox_mailer = _get_setting('OUTBOX_MAILER', 'juntagrico.util.defaultmailer.Mailer')
+    mail_batch_size = _get_setting('MAIL_BATCH_SIZE', 50)
 
     # template settings
     mail_template = _get_setting('MAIL_TEMPLATE', 'mails/email.html')
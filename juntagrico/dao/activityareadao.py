@@ -7,6 +7,10 @@ class ActivityAreaDao:
     def all_visible_areas():
         return ActivityArea.objects.filter(hidden=False)
 
+    @staticmethod
+    def area_names_by_member():
+        return ActivityArea.members.through.objects.order_by('activityarea').values_list('member', 'activityarea__name')
+
     @staticmethod
     def areas_by_coordinator(member):
         return ActivityArea.objects.filter(coordinator=member)
@@ -1,11 +1,17 @@
+import threading
+from contextlib import contextmanager
 from datetime import datetime, time
 
+from django.db.models import Count, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.utils.timezone import get_default_timezone as gdtz
 
 import juntagrico
 from juntagrico.util.temporal import start_of_business_year
 
+_slot_recount = threading.local()
+
 
 class AssignmentDao:
 
@@ -27,6 +33,85 @@ class AssignmentDao:
         return juntagrico.entity.jobs.Assignment.objects.filter(member=member).\
             filter(job__time__gte=start, job__time__lt=timezone.now())
 
+    @staticmethod
+    def assignment_amounts_for_member_and_partners_current_business_year(member):
+        '''
+        sum of amounts and core amounts of the assignments of the member and its subscription partners
+        in the current business year grouped by member
+        '''
+        start = gdtz().localize(datetime.combine(start_of_business_year(), time.min))
+        members = Q(member=member)
+        if member.subscription is not None:
+            members |= Q(member__in=member.subscription.recipients_all)
+        return juntagrico.entity.jobs.Assignment.objects.filter(members).\
+            filter(job__time__gte=start, job__time__lt=timezone.now()).\
+            values('member').order_by().\
+            annotate(amount_sum=Sum('amount'), core_amount_sum=Sum('amount', filter=Q(core_cache=True)))
+
     @staticmethod
     def upcomming_assignments_for_member(member):
         return juntagrico.entity.jobs.Assignment.objects.filter(member=member).filter(job__time__gte=timezone.now())
+
+    @staticmethod
+    def update_occupied_slots(job_ids=None):
+        '''
+        recount the assignments into the occupied_slots counter of the jobs with the given ids or of all jobs.
+        returns the number of updated jobs
+        '''
+        counts = juntagrico.entity.jobs.Assignment.objects.filter(job=OuterRef('pk')).order_by().values('job')\
+            .annotate(count=Count('id')).values('count')
+        jobs = juntagrico.entity.jobs.Job.objects.non_polymorphic()
+        if job_ids is not None:
+            jobs = jobs.filter(pk__in=job_ids)
+        return jobs.update(occupied_slots=Coalesce(Subquery(counts), 0))
+
+    @staticmethod
+    def member_emails_by_job(job_ids):
+        '''
+        the distinct email addresses of the members assigned to the jobs with the given ids in one query, by job id
+        '''
+        emails = {}
+        for job_id, email in juntagrico.entity.jobs.Assignment.objects.filter(job__in=job_ids)\
+                .values_list('job_id', 'member__email').distinct():
+            emails.setdefault(job_id, []).append(email)
+        return emails
+
+    @staticmethod
+    def participants_by_jobs(job_ids):
+        '''
+        the distinct member ids and subscription ids of the members assigned to the jobs with the given ids
+        '''
+        participants = juntagrico.entity.jobs.Assignment.objects.filter(job__in=job_ids)\
+            .values_list('member_id', 'member__subscription_id').distinct()
+        member_ids, subscription_ids = zip(*participants) if participants else ((), ())
+        return member_ids, subscription_ids
+
+    @staticmethod
+    @contextmanager
+    def slot_recount_suspended():
+        '''
+        within this context the save and delete handlers of the assignments do not recount the occupied slots
+        of their jobs and do not invalidate the menus of their members. the caller has to recount them with
+        update_occupied_slots and invalidate the menus
+        '''
+        previous = getattr(_slot_recount, 'suspended', False)
+        _slot_recount.suspended = True
+        try:
+            yield
+        finally:
+            _slot_recount.suspended = previous
+
+    @staticmethod
+    def slot_recount_is_suspended():
+        return getattr(_slot_recount, 'suspended', False)
+
+    @staticmethod
+    def delete_assignments_for_jobs(job_ids):
+        '''
+        delete the assignments of the jobs with the given ids and reset the occupied slots of the jobs
+        with a single recount instead of one per assignment
+        '''
+        with AssignmentDao.slot_recount_suspended():
+            count, deleted = juntagrico.entity.jobs.Assignment.objects.filter(job__in=job_ids).delete()
+        AssignmentDao.update_occupied_slots(job_ids)
+        return count
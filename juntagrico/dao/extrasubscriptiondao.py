@@ -1,3 +1,5 @@
+from django.db.models import Count, Q
+
 from juntagrico.entity.extrasubs import ExtraSubscription
 
 
@@ -25,3 +27,23 @@ class ExtraSubscriptionDao:
         return ExtraSubscription.objects.\
             exclude(deactivation_date__lt=fromdate).\
             exclude(activation_date__gt=tilldate)
+
+    @staticmethod
+    def active_type_amounts_by_subscription(subscriptions):
+        return ExtraSubscription.objects.filter(main_subscription__in=subscriptions, active=True)\
+            .values('main_subscription', 'type').order_by().annotate(amount=Count('id'))
+
+    @staticmethod
+    def active_extra_subscriptions_for_subscriptions(subscriptions):
+        return ExtraSubscription.objects.filter(main_subscription__in=subscriptions, active=True)
+
+    @staticmethod
+    def type_amounts(subscriptions, future_subscriptions):
+        """
+        number of active extra subscriptions of the subscriptions and of future extra subscriptions
+        of the future subscriptions per extra subscription type name
+        """
+        future = Q(active=False, deactivation_date=None) | Q(active=True, canceled=False)
+        return ExtraSubscription.objects.values('type__name').order_by().annotate(
+            now=Count('id', filter=Q(active=True, main_subscription__in=subscriptions)),
+            future=Count('id', filter=future & Q(main_subscription__in=future_subscriptions)))
@@ -1,10 +1,12 @@
 from datetime import datetime, time, date
 
+from django.db.models import Prefetch, Q
 from django.utils import timezone
 from django.utils.timezone import get_default_timezone as gdtz
 
 from juntagrico.config import Config
-from juntagrico.entity.jobs import Job, RecuringJob, OneTimeJob
+from juntagrico.entity.jobs import Job, RecuringJob, OneTimeJob, JobExtra, Assignment
+from juntagrico.util.jobs import JobDetail, JobListEntry
 
 
 class JobDao:
@@ -36,6 +38,19 @@ class JobDao:
     def jobs_to_remind(now, end):
         return Job.objects.filter(time__range=(now, end), reminder_sent__exact=False)
 
+    @staticmethod
+    def jobs_to_remind_with_participants(now, end):
+        '''
+        jobs to remind with their types, areas, coordinators and assigned members loaded in four queries
+        '''
+        job_ids = JobDao.jobs_to_remind(now, end).values('id')
+        assignments = Prefetch('assignment_set', queryset=Assignment.objects.select_related('member').order_by('id'))
+        recuring_jobs = RecuringJob.objects.non_polymorphic().filter(id__in=job_ids)\
+            .select_related('type__activityarea__coordinator').prefetch_related(assignments)
+        onetime_jobs = OneTimeJob.objects.non_polymorphic().filter(id__in=job_ids)\
+            .select_related('activityarea__coordinator').prefetch_related(assignments)
+        return list(recuring_jobs) + list(onetime_jobs)
+
     @staticmethod
     def get_current_jobs():
         return Job.objects.filter(time__gte=timezone.now()).order_by('time')
@@ -65,3 +80,65 @@ class JobDao:
     @staticmethod
     def upcomming_jobs_for_member(member):
         return Job.objects.filter(time__gte=timezone.now(), assignment__member=member).distinct()
+
+    @staticmethod
+    def get_current_jobs_by_area(area):
+        return JobDao.jobs_by_area(area).filter(time__gte=timezone.now()).order_by('time')
+
+    @staticmethod
+    def jobs_by_text(text):
+        return Job.objects.filter(Q(recuringjob__type__name__icontains=text) |
+                                  Q(recuringjob__type__displayed_name__icontains=text) |
+                                  Q(recuringjob__type__activityarea__name__icontains=text) |
+                                  Q(onetimejob__name__icontains=text) |
+                                  Q(onetimejob__displayed_name__icontains=text) |
+                                  Q(onetimejob__activityarea__name__icontains=text))
+
+    @staticmethod
+    def jobs_on_days(days):
+        return Job.objects.filter(time__date__in=days)
+
+    @staticmethod
+    def jobs_by_area(area_id):
+        return Job.objects.filter(Q(recuringjob__type__activityarea=area_id) | Q(onetimejob__activityarea=area_id))
+
+    @staticmethod
+    def jobs_for_list(jobs):
+        '''
+        load jobs with their types, areas, occupied places and extras in a fixed number of queries.
+        returns a list of JobListEntry in the order of the given job queryset
+        '''
+        ordered_ids = list(jobs.values_list('id', flat=True))
+        job_ids = jobs.values('id')
+        loaded = {}
+        recuring_jobs = RecuringJob.objects.non_polymorphic().filter(id__in=job_ids).select_related('type__activityarea')
+        onetime_jobs = OneTimeJob.objects.non_polymorphic().filter(id__in=job_ids).select_related('activityarea')
+        for queryset in [recuring_jobs, onetime_jobs]:
+            for job in queryset:
+                loaded[job.id] = job
+        extras_by_type = {}
+        for extra in JobExtra.objects.filter(Q(recuring_type__recuringjob__in=job_ids) | Q(onetime_type__in=job_ids))\
+                .select_related('extra_type').distinct():
+            key = extra.recuring_type_id if extra.recuring_type_id is not None else extra.onetime_type_id
+            extras_by_type.setdefault((extra.recuring_type_id is None, key), []).append(extra)
+        full_extras = {}
+        for job_id, extra_id in Assignment.job_extras.through.objects.filter(assignment__job__in=job_ids)\
+                .values_list('assignment__job_id', 'jobextra_id').distinct():
+            full_extras.setdefault(job_id, set()).add(extra_id)
+        result = []
+        for job_id in ordered_ids:
+            job = loaded[job_id]
+            onetime = isinstance(job, OneTimeJob)
+            extras = extras_by_type.get((onetime, job.id if onetime else job.type_id), [])
+            result.append(JobListEntry(job, job.occupied_slots, extras, full_extras.get(job.id, set())))
+        return result
+
+    @staticmethod
+    def job_detail(job):
+        '''
+        load the assignments of the job with their members and extras and the extras of the job type in three queries
+        '''
+        assignments = Assignment.objects.filter(job=job).select_related('member').order_by('id')\
+            .prefetch_related(Prefetch('job_extras', queryset=JobExtra.objects.select_related('extra_type')))
+        extras = job.type.job_extras_set.select_related('extra_type')
+        return JobDetail(job, list(assignments), list(extras))
@@ -35,6 +35,10 @@ class MemberDao:
     def members_for_subscription(subscription):
         return Member.objects.filter((Q(subscription=None) & Q(future_subscription=None)) | Q(subscription=subscription))
 
+    @staticmethod
+    def active_members_for_subscriptions(subscriptions):
+        return Member.objects.filter(subscription__in=subscriptions, inactive=False)
+
     @staticmethod
     def members_for_future_subscription(subscription):
         return Member.objects.filter((Q(subscription=None) | Q(subscription__canceled=True)) & Q(future_subscription=None) | Q(future_subscription=subscription))
@@ -0,0 +1,8 @@
+from juntagrico.entity.mailing import OutboxEmail
+
+
+class OutboxEmailDao:
+
+    @staticmethod
+    def due_emails(now):
+        return OutboxEmail.objects.filter(failed=False, next_attempt__lte=now).order_by('next_attempt', 'id')
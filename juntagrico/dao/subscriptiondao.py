@@ -1,4 +1,14 @@
-from juntagrico.entity.subs import Subscription
+from datetime import datetime, time
+
+from django.db.models import Count, F, FloatField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.timezone import get_default_timezone as gdtz
+
+from juntagrico.entity.jobs import Assignment
+from juntagrico.entity.subs import Subscription, TYPE_TOTALS
+from juntagrico.entity.subtypes import TFSST, TSST
+from juntagrico.util.temporal import start_of_business_year
 
 
 class SubscriptionDao:
@@ -41,3 +51,44 @@ class SubscriptionDao:
         return Subscription.objects.\
             exclude(deactivation_date__lt=fromdate).exclude(
                 activation_date__gt=tilldate)
+
+    @staticmethod
+    def annotate_type_totals(subscriptions):
+        '''
+        annotate the sums of shares, assignments and price over the current types,
+        which are then used by the corresponding properties of the subscriptions instead of loading the types
+        '''
+        return subscriptions.annotate(**{annotation: Sum('types__' + field) for field, annotation in TYPE_TOTALS.items()})
+
+    @staticmethod
+    def annotate_assignment_counts(subscriptions):
+        '''
+        annotate the sums of the assignments and core assignments the members of the subscriptions did in the current business year.
+        subqueries are used, so that the sums are not multiplied by other joined annotations like annotate_type_totals
+        '''
+        now = timezone.now()
+        start = gdtz().localize(datetime.combine(start_of_business_year(), time.min))
+        assignments = Assignment.objects.filter(member__subscription=OuterRef('pk'), job__time__gte=start, job__time__lt=now)
+
+        def amount_sum(assignments):
+            return Coalesce(Subquery(assignments.order_by().values('member__subscription').annotate(amount_sum=Sum('amount'))
+                                     .values('amount_sum'), output_field=FloatField()), Value(0.0))
+        return subscriptions.annotate(assignment_count=amount_sum(assignments),
+                                      core_assignment_count=amount_sum(assignments.filter(core_cache=True)))
+
+    @staticmethod
+    def subscriptions_with_changed_types(subscriptions):
+        '''
+        the subscriptions whose future types differ from their current types, in a single query.
+        a type is changed if it occurs a different number of times in the current and the future types
+        '''
+        return subscriptions.filter(Q(id__in=SubscriptionDao._differing_type_amounts(TSST, TFSST)) |
+                                    Q(id__in=SubscriptionDao._differing_type_amounts(TFSST, TSST)))
+
+    @staticmethod
+    def _differing_type_amounts(through, other_through):
+        other_amount = other_through.objects.filter(subscription=OuterRef('subscription'), type=OuterRef('type'))\
+            .values('subscription').order_by().annotate(amount=Count('id')).values('amount')
+        return through.objects.values('subscription', 'type').order_by()\
+            .annotate(amount=Count('id'), other_amount=Coalesce(Subquery(other_amount), 0))\
+            .exclude(amount=F('other_amount')).values('subscription')
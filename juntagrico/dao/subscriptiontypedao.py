@@ -1,4 +1,6 @@
-from juntagrico.entity.subtypes import SubscriptionType
+from django.db.models import Count
+
+from juntagrico.entity.subtypes import SubscriptionType, TFSST, TSST
 
 
 class SubscriptionTypeDao:
@@ -10,3 +12,18 @@ class SubscriptionTypeDao:
     @staticmethod
     def get_by_id(identifier):
         return SubscriptionType.objects.filter(id=identifier)
+
+    @staticmethod
+    def size_amounts_by_subscription(subscriptions):
+        return TSST.objects.filter(subscription__in=subscriptions).values('subscription', 'type__size', 'type__size__units')\
+            .order_by().annotate(amount=Count('id'))
+
+    @staticmethod
+    def size_amounts(subscriptions):
+        return TSST.objects.filter(subscription__in=subscriptions).values('type__size').order_by()\
+            .annotate(amount=Count('id'))
+
+    @staticmethod
+    def future_size_amounts(subscriptions):
+        return TFSST.objects.filter(subscription__in=subscriptions).values('type__size').order_by()\
+            .annotate(amount=Count('id'))
@@ -4,7 +4,11 @@ from polymorphic.models import PolymorphicModel
 
 
 class OldHolder:
-    '''find a better name'''
+    '''
+    holds the values of the fields in old_state_fields as they were loaded or last saved in _old,
+    so that the lifecycle handlers can detect changes
+    '''
+    old_state_fields = ('active', 'canceled', 'inactive', 'time', 'deactivation_date')
     _old = None
 
 
@@ -136,18 +136,27 @@ class JobType(AbstractJobType):
 class Job(JuntagricoBasePoly):
     slots = models.PositiveIntegerField(_('Plätze'), default=0)
     infinite_slots = models.BooleanField(_('Unendlich Plätze'), default=False)
-    time = models.DateTimeField(_('Zeitpunkt'))
+    time = models.DateTimeField(_('Zeitpunkt'), db_index=True)
     multiplier = models.PositiveIntegerField(
         _('{0}) vielfaches').format(Config.vocabulary('assignment')), default=1)
     pinned = models.BooleanField(default=False)
     reminder_sent = models.BooleanField(
         _('Reminder verschickt'), default=False)
     canceled = models.BooleanField(_('abgesagt'), default=False)
+    # counter of the assigned slots, written by AssignmentDao.update_occupied_slots whenever assignments
+    # or the job are saved or deleted
+    occupied_slots = models.PositiveIntegerField(_('Besetzte Plätze'), default=0, editable=False, db_index=True)
 
     @property
     def type(self):
         raise NotImplementedError
 
+    @classmethod
+    def post_save(cls, sender, instance, created, **kwargs):
+        # saving an outdated instance writes its old counter, which is recounted right away
+        if not created:
+            AssignmentDao.update_occupied_slots([instance.pk])
+
     def __str__(self):
         return _('Job {0}').format(self.id)
 
@@ -163,7 +172,7 @@ class Job(JuntagricoBasePoly):
         if self.infinite_slots:
             return -1
         if not (self.slots is None):
-            return self.slots - self.occupied_places()
+            return self.slots - self.occupied_slots
         return 0
 
     free_slots.fget.short_description = _('Freie Plätze')
@@ -175,13 +184,12 @@ class Job(JuntagricoBasePoly):
         return self.time
 
     def occupied_places(self):
-        return self.assignment_set.count()
+        return self.occupied_slots
 
     def get_status_percentage(self):
-        assignments = AssignmentDao.assignments_for_job(self.id)
         if self.slots < 1:
             return get_status_image(100)
-        return get_status_image(assignments.count() * 100 / self.slots)
+        return get_status_image(self.occupied_slots * 100 / self.slots)
 
     def is_core(self):
         return self.type.activityarea.core
@@ -268,6 +276,9 @@ class Assignment(JuntagricoBaseModel):
     job_extras = models.ManyToManyField(JobExtra, related_name='assignments', blank=True, verbose_name=_('Job Extras'))
     amount = models.FloatField(_('Wert'))
 
+    # the previous job of a moved assignment needs its occupied slots updated as well
+    old_state_fields = ('job_id',)
+
     def __str__(self):
         return '%s #%s' % (Config.vocabulary('assignment'), self.id)
 
@@ -282,6 +293,20 @@ class Assignment(JuntagricoBaseModel):
     def pre_save(cls, sender, instance, **kwargs):
         instance.core_cache = instance.is_core()
 
+    @classmethod
+    def post_save(cls, sender, instance, **kwargs):
+        if AssignmentDao.slot_recount_is_suspended():
+            return
+        job_ids = {instance.job_id}
+        if instance._old is not None and instance._old.get('job_id') is not None:
+            job_ids.add(instance._old['job_id'])
+        AssignmentDao.update_occupied_slots(job_ids)
+
+    @classmethod
+    def post_delete(cls, sender, instance, **kwargs):
+        if not AssignmentDao.slot_recount_is_suspended():
+            AssignmentDao.update_occupied_slots([instance.job_id])
+
     class Meta:
         verbose_name = Config.vocabulary('assignment')
         verbose_name_plural = Config.vocabulary('assignment_pl')
@@ -1,4 +1,7 @@
+import pickle
+
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext as _
 
 from juntagrico.entity import JuntagricoBaseModel
@@ -20,3 +23,36 @@ class MailTemplate(JuntagricoBaseModel):
         verbose_name_plural = _('MailTemplates')
         permissions = (('can_load_templates', _(
             'Benutzer kann Templates laden')),)
+
+
+class OutboxEmail(JuntagricoBaseModel):
+    '''
+    Email waiting to be delivered by the send_outbox command
+    '''
+    subject = models.TextField(_('Betreff'))
+    recipients = models.TextField(_('Empfänger'))
+    message = models.BinaryField()
+    created = models.DateTimeField(_('Erstellt'), auto_now_add=True)
+    next_attempt = models.DateTimeField(_('Nächster Versuch'), default=timezone.now, db_index=True)
+    attempts = models.PositiveIntegerField(_('Versuche'), default=0)
+    failed = models.BooleanField(_('Fehlgeschlagen'), default=False)
+    last_error = models.TextField(_('Letzter Fehler'), blank=True, default='')
+
+    @staticmethod
+    def from_email_message(email):
+        # the connection is opened by the send_outbox command
+        connection, email.connection = email.connection, None
+        message = pickle.dumps(email)
+        email.connection = connection
+        return OutboxEmail(subject=email.subject, recipients=', '.join(email.recipients()), message=message)
+
+    @property
+    def email_message(self):
+        return pickle.loads(self.message)
+
+    def __str__(self):
+        return self.subject
+
+    class Meta:
+        verbose_name = _('Ausstehende E-Mail')
+        verbose_name_plural = _('Ausstehende E-Mails')
@@ -56,6 +56,9 @@ class Member(JuntagricoBaseModel):
         _('Notizen'), max_length=1000, blank=True,
         help_text=_('Notizen für Administration. Nicht sichtbar für {}'.format(Config.vocabulary('member'))))
 
+    # the partners in the previous subscription need their menus invalidated
+    old_state_fields = JuntagricoBaseModel.old_state_fields + ('subscription_id',)
+
     @property
     def active_shares(self):
         """ :return: shares that have been paid by member and not cancelled AND paid back yet
@@ -14,6 +14,14 @@ from juntagrico.entity.depot import Depot
 from juntagrico.lifecycle.sub import check_sub_consistency
 from juntagrico.util.temporal import start_of_next_business_year
 
+# names of the annotations added by SubscriptionDao.annotate_type_totals for the sums over the fields of the types
+TYPE_TOTALS = {
+    'shares': 'types_shares_total',
+    'required_assignments': 'types_required_assignments_total',
+    'required_core_assignments': 'types_required_core_assignments_total',
+    'price': 'types_price_total',
+}
+
 
 class Subscription(Billable):
     '''
@@ -50,11 +58,12 @@ class Subscription(Billable):
         _('Notizen'), max_length=1000, blank=True,
         help_text=_('Notizen für Administration. Nicht sichtbar für {}'.format(Config.vocabulary('member'))))
     _future_members = None
+    _types_memo = None
 
     def __str__(self):
         namelist = [_(' Einheiten {0}').format(self.size)]
         namelist.extend(
-            extra.type.name for extra in self.extra_subscriptions.all())
+            extra.type.name for extra in self.active_extra_subscriptions)
         return _('Abo ({1}) {0}').format(' + '.join(namelist), self.id)
 
     def __repr__(self):
@@ -64,13 +73,47 @@ class Subscription(Billable):
     def overview(self):
         namelist = [_(' Einheiten {0}').format(self.size)]
         namelist.extend(
-            extra.type.name for extra in self.extra_subscriptions.all())
+            extra.type.name for extra in self.active_extra_subscriptions)
         return '%s' % (' + '.join(namelist))
 
+    @property
+    def types_with_sizes(self):
+        '''
+        the current types with their sizes and products, loaded only once per instance.
+        uses the prefetched types if the subscription was loaded with prefetch_related('types__size__product')
+        or with a Prefetch of the types with their sizes and products to the attribute prefetched_types
+        '''
+        if self._types_memo is None:
+            if hasattr(self, 'prefetched_types'):
+                self._types_memo = self.prefetched_types
+            elif 'types' in getattr(self, '_prefetched_objects_cache', {}):
+                self._types_memo = list(self.types.all())
+            else:
+                self._types_memo = list(self.types.select_related('size__product'))
+        return self._types_memo
+
+    def reset_types_memo(self):
+        '''
+        discard the memoized types and annotated type totals after the types of the subscription changed
+        '''
+        self._types_memo = None
+        for annotation in TYPE_TOTALS.values():
+            self.__dict__.pop(annotation, None)
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self.reset_types_memo()
+
+    def _type_total(self, field):
+        annotation = TYPE_TOTALS[field]
+        if annotation in self.__dict__:
+            return self.__dict__[annotation] or 0
+        return sum(getattr(type, field) for type in self.types_with_sizes)
+
     @property
     def size(self):
         sizes = {}
-        for type in self.types.all():
+        for type in self.types_with_sizes:
             sizes[type.size.product.name] = type.size.units + sizes.get(type.size.product.name, 0)
         return ', '.join([key + ':' + str(value) for key, value in sizes.items()])
 
@@ -128,6 +171,16 @@ class Subscription(Billable):
     def extra_subscriptions(self):
         return self.extra_subscription_set.filter(active=True)
 
+    @property
+    def active_extra_subscriptions(self):
+        '''
+        the active extra subscriptions. uses the extra subscriptions prefetched with a Prefetch
+        of the active extra subscriptions to the attribute prefetched_active_extra_subscriptions
+        '''
+        if hasattr(self, 'prefetched_active_extra_subscriptions'):
+            return self.prefetched_active_extra_subscriptions
+        return self.extra_subscriptions.all()
+
     @property
     def future_extra_subscriptions(self):
         return self.extra_subscription_set.filter(
@@ -182,7 +235,8 @@ class Subscription(Billable):
     @staticmethod
     def get_size_name(types=[]):
         size_dict = {}
-        for type in types.all():
+        types = types.all() if hasattr(types, 'all') else types
+        for type in types:
             size_dict[type.__str__()] = 1 + size_dict.get(type.__str__(), 0)
         size_names = [key + ':' + str(value) for key, value in size_dict.items()]
         if len(size_names) > 0:
@@ -191,35 +245,23 @@ class Subscription(Billable):
 
     @property
     def required_shares(self):
-        result = 0
-        for type in self.types.all():
-            result += type.shares
-        return result
+        return self._type_total('shares')
 
     @property
     def required_assignments(self):
-        result = 0
-        for type in self.types.all():
-            result += type.required_assignments
-        return result
+        return self._type_total('required_assignments')
 
     @property
     def required_core_assignments(self):
-        result = 0
-        for type in self.types.all():
-            result += type.required_core_assignments
-        return result
+        return self._type_total('required_core_assignments')
 
     @property
     def price(self):
-        result = 0
-        for type in self.types.all():
-            result += type.price
-        return result
+        return self._type_total('price')
 
     @property
     def size_name(self):
-        return Subscription.get_size_name(types=self.types)
+        return Subscription.get_size_name(types=self.types_with_sizes)
 
     @property
     def future_size_name(self):
@@ -97,6 +97,14 @@ class TSST(JuntagricoBaseModel):
     type = models.ForeignKey(
         'SubscriptionType', related_name='TTSST', on_delete=models.PROTECT)
 
+    @classmethod
+    def reset_subscription_types_memo(cls, sender, instance, **kwargs):
+        if TSST.subscription.is_cached(instance):
+            instance.subscription.reset_types_memo()
+
+    class Meta:
+        indexes = [models.Index(fields=['subscription', 'type'])]
+
 
 class TFSST(JuntagricoBaseModel):
     '''
@@ -108,3 +116,6 @@ class TFSST(JuntagricoBaseModel):
         'SubscriptionType', related_name='TTFSST', on_delete=models.PROTECT,
         help_text='Muss gleich eingestellt sein wie {}-Typen oben, wenn keine Änderung ansteht'
         .format(Config.vocabulary('subscription')))
+
+    class Meta:
+        indexes = [models.Index(fields=['subscription', 'type'])]
@@ -15,12 +15,10 @@ def job_pre_save(sender, instance, **kwargs):
 
 
 def handle_job_canceled(sender, instance, **kwargs):
-    assignments = AssignmentDao.assignments_for_job(instance.id)
-    emails = set()
-    for assignment in assignments:
-        emails.add(assignment.member.email)
-        assignment.delete()
+    emails = AssignmentDao.member_emails_by_job([instance.id]).get(instance.id, [])
+    AssignmentDao.delete_assignments_for_jobs([instance.id])
     instance.slots = 0
+    instance.occupied_slots = 0
     if len(emails) > 0:
         membernotification.job_canceled(emails, instance)
 
@@ -1,4 +1,5 @@
 from django.core.exceptions import ValidationError
+from django.db.models import Count, Q
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
@@ -22,12 +23,13 @@ def sub_pre_save(sender, instance, **kwargs):
 
 def handle_sub_activated(sender, instance, **kwargs):
     instance.activation_date = instance.activation_date if instance.activation_date is not None else timezone.now().date()
-    for member in instance.recipients_all_for_state('waiting'):
-        if member.subscription is not None:
-            raise ValidationError(
-                _('Ein Bezüger hat noch ein/e/n aktive/n/s {0}').format(Config.vocabulary('subscription')),
-                code='invalid')
-    for member in instance.recipients_all_for_state('waiting'):
+    future_members = list(instance.recipients_all_for_state('waiting'))
+    if any(member.subscription_id is not None for member in future_members):
+        raise ValidationError(
+            _('Ein Bezüger hat noch ein/e/n aktive/n/s {0}').format(Config.vocabulary('subscription')),
+            code='invalid')
+    # the members are saved one by one, so that their signals are sent
+    for member in future_members:
         member.subscription = instance
         member.future_subscription = None
         member.save()
@@ -35,10 +37,13 @@ def handle_sub_activated(sender, instance, **kwargs):
 
 def handle_sub_deactivated(sender, instance, **kwargs):
     instance.deactivation_date = instance.deactivation_date if instance.deactivation_date is not None else timezone.now().date()
-    for member in instance.recipients_all_for_state('active'):
-        member.old_subscriptions.add(instance)
+    members = list(instance.recipients_all_for_state('active').annotate(
+        open_shares=Count('share', filter=Q(share__payback_date__isnull=True))))
+    instance.members_old.add(*members)
+    # the members are saved one by one, so that their signals are sent
+    for member in members:
         member.subscription = None
-        if member.share_set.filter(payback_date__isnull=True).count() == 0:
+        if member.open_shares == 0:
             member.inactive = True
         member.save()
 
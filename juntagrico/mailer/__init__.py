@@ -1,4 +1,6 @@
+import copy
 import logging
+import math
 
 from django.conf import settings
 from django.core.mail import EmailMultiAlternatives
@@ -40,8 +42,11 @@ def get_emails_by_permission(permission_code):
 
 def filter_whitelist_emails(to_emails):
     if settings.DEBUG:
-        ok_mails = [x for x in to_emails if x in settings.WHITELIST_EMAILS]
-        not_send = [x for x in to_emails if x not in settings.WHITELIST_EMAILS]
+        whitelist = set(settings.WHITELIST_EMAILS)
+        ok_mails = []
+        not_send = []
+        for email in to_emails:
+            (ok_mails if email in whitelist else not_send).append(email)
         log.info(('Mail not sent to: ' + ', '.join(not_send) + ' not in whitelist'))
         return ok_mails
     else:
@@ -56,6 +61,19 @@ def get_thread_id(obj):
     return f'<{type(obj).__name__}{obj.id}@{Config.server_url()}>'
 
 
+def open_mailer_connection():
+    '''
+    open a connection of the configured mailer to send several mails over. mailers only storing the mails,
+    like the outbox mailer, do not provide a get_connection method and None is returned
+    '''
+    mailer = import_string(Config.default_mailer())
+    if not hasattr(mailer, 'get_connection'):
+        return None
+    connection = mailer.get_connection()
+    connection.open()
+    return connection
+
+
 class EmailSender:
 
     @staticmethod
@@ -88,6 +106,28 @@ class EmailSender:
         mailer = import_string(Config.default_mailer())
         mailer.send(self.email)
 
+    def send_batched(self, bcc, batch_size=None):
+        '''
+        send the email to the bcc recipients in batches of MAIL_BATCH_SIZE recipients over a single connection,
+        if the configured mailer sends over one.
+        returns the number of recipients
+        '''
+        bcc = list(bcc)
+        batch_size = batch_size or Config.mail_batch_size()
+        batches = math.ceil(len(bcc) / batch_size)
+        connection = open_mailer_connection()
+        try:
+            for batch in range(batches):
+                email = copy.copy(self.email)
+                email.connection = connection
+                email.bcc = bcc[batch * batch_size:(batch + 1) * batch_size]
+                EmailSender(email).send()
+                log.info('Mail batch {} of {} sent'.format(batch + 1, batches))
+        finally:
+            if connection is not None:
+                connection.close()
+        return len(bcc)
+
     @chainable
     def attach_html(self, html):
         self.email.attach_alternative(html, 'text/html')
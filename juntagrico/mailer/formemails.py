@@ -37,5 +37,5 @@ def internal(subject, message, text_message, emails, files, sender):
     })
     text_content = get_template('mails/form/filtered_mail.txt').render(textd)
     html_content = get_template('mails/form/filtered_mail.html').render(htmld)
-    EmailSender.get_sender(subject, text_content, bcc=emails, from_email=sender)\
-        .attach_html(html_content).attach_files(files).send()
+    return EmailSender.get_sender(subject, text_content, from_email=sender)\
+        .attach_html(html_content).attach_files(files).send_batched(sorted(emails))
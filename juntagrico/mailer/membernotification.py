@@ -70,12 +70,13 @@ def job_signup(email, job):
     ).attach_ics(generate_ical_for_job(job)).start_thread(job).send_to(email)
 
 
-def job_reminder(emails, job, participants):
+def job_reminder(emails, job, participants, connection=None):
     contact = job.type.activityarea.coordinator.get_name() + ': ' + job.type.activityarea.contact()
     EmailSender.get_sender(
         organisation_subject(_('Einsatz-Erinnerung')),
         get_email_content('j_reminder', base_dict(locals())),
-        bcc=emails
+        bcc=emails,
+        connection=connection
     ).attach_ics(generate_ical_for_job(job)).continue_thread(job).send()
 
 
@@ -0,0 +1,55 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from juntagrico.util.benchmark import TARGETS, benchmark_sandbox, format_report, run_benchmark
+from juntagrico.util.testdata import generate_dataset
+
+
+class Command(BaseCommand):
+    help = 'Measure the time and the number of queries of the main views, the excel exports and the depot list generation. ' \
+           'All changes to the database are rolled back afterwards and the depot lists are written to a temporary directory'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--members', type=int, default=0,
+                            help='generate a dataset with this number of members before the benchmark, '
+                                 'see generate_testdata_bulk. by default the existing data is used')
+        parser.add_argument('--depots', type=int, default=20, help='number of depots to generate')
+        parser.add_argument('--jobs', type=int, default=500, help='number of jobs to generate')
+        parser.add_argument('--assignments', type=int, default=10000, help='number of assignments to generate')
+        parser.add_argument('--seed', type=int, default=0, help='seed of the generated dataset')
+        parser.add_argument('--repeat', type=int, default=3, help='number of runs per target')
+        parser.add_argument('--target', action='append', choices=TARGETS, dest='targets',
+                            help='only run this target, can be given several times')
+        parser.add_argument('--output', help='write the results as json to this file')
+        parser.add_argument('--baseline', help='json file of an earlier run to compare the results with')
+
+    # entry point used by manage.py
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('repeat must be at least 1')
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as baseline_file:
+                baseline = json.load(baseline_file)
+        # allows the requests of the test client and keeps the mails of the depot list generation in memory
+        try:
+            setup_test_environment()
+            teardown = True
+        except RuntimeError:
+            # already set up, e.g. when called from a test
+            teardown = False
+        try:
+            with benchmark_sandbox():
+                if options['members'] > 0:
+                    generate_dataset(options['members'], options['depots'], options['jobs'], options['assignments'],
+                                     options['seed'])
+                results = run_benchmark(options['targets'], options['repeat'])
+        finally:
+            if teardown:
+                teardown_test_environment()
+        self.stdout.write(format_report(results, baseline))
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                json.dump(results, output_file, indent=2)
@@ -0,0 +1,51 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from juntagrico.entity.jobs import JobType
+from juntagrico.util.jobs import job_series_dates
+from juntagrico.util.management import create_job_series
+
+
+def _date(value):
+    return datetime.datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def _time(value):
+    return datetime.datetime.strptime(value, '%H:%M').time()
+
+
+class Command(BaseCommand):
+    help = 'Create a series of recuring jobs of one or more job types on the given weekdays between two dates'
+
+    def add_arguments(self, parser):
+        parser.add_argument('types', nargs='+', help='names of the job types')
+        parser.add_argument('--start', type=_date, required=True, help='first date (YYYY-MM-DD)')
+        parser.add_argument('--end', type=_date, required=True, help='last date (YYYY-MM-DD)')
+        parser.add_argument('--weekday', type=int, action='append', dest='weekdays', required=True,
+                            choices=range(1, 8), help='iso weekday of the jobs (1 is monday), can be given several times')
+        parser.add_argument('--time', type=_time, required=True, help='start time of the jobs (HH:MM)')
+        parser.add_argument('--slots', type=int, required=True, help='number of slots per job')
+        parser.add_argument('--multiplier', type=int, default=1, help='assignment multiplier of the jobs')
+        parser.add_argument('--interval', type=int, choices=[7, 14], default=7,
+                            help='7 for every week, 14 for every second week')
+        parser.add_argument('--preview', action='store_true', help='only print the dates, do not create the jobs')
+
+    # entry point used by manage.py
+    def handle(self, *args, **options):
+        job_types = list(JobType.objects.filter(name__in=options['types']))
+        missing = set(options['types']) - set(job_type.name for job_type in job_types)
+        if missing:
+            raise CommandError('unknown job types: {}'.format(', '.join(sorted(missing))))
+        dates = job_series_dates(options['start'], options['end'], options['weekdays'], options['interval'])
+        if not dates:
+            raise CommandError('no date between start and end falls on the given weekdays')
+        self.stdout.write('{} jobs per type on {}'.format(
+            len(dates), ', '.join(date.strftime('%d.%m.%Y') for date in dates)))
+        if options['preview']:
+            return
+        with transaction.atomic():
+            for job_type in job_types:
+                job_ids = create_job_series(job_type, dates, options['time'], options['slots'], options['multiplier'])
+                self.stdout.write('{} jobs of {} created'.format(len(job_ids), job_type.name))
@@ -8,7 +8,7 @@ from juntagrico.dao.listmessagedao import ListMessageDao
 from juntagrico.dao.subscriptiondao import SubscriptionDao
 from juntagrico.dao.subscriptionproductdao import SubscriptionProductDao
 from juntagrico.mailer import membernotification
-from juntagrico.util.pdf import render_to_pdf_storage
+from juntagrico.util.depot_list import depot_list_matrix, generate_depot_list_pdfs
 from juntagrico.util.temporal import weekdays
 
 
@@ -31,6 +31,22 @@ class Command(BaseCommand):
             default=False,
             help='when forced do not ignore future depots',
         )
+        # Named (optional) arguments
+        parser.add_argument(
+            '--rerender',
+            action='store_true',
+            dest='rerender',
+            default=False,
+            help='render the depot list of all depots, even if their data did not change',
+        )
+        # Named (optional) arguments
+        parser.add_argument(
+            '--processes',
+            type=int,
+            dest='processes',
+            default=None,
+            help='number of processes rendering the pdfs, defaults to the number of cpus',
+        )
 
     # entry point used by manage.py
     def handle(self, *args, **options):
@@ -56,15 +72,12 @@ class Command(BaseCommand):
             'subscriptions': SubscriptionDao.all_active_subscritions(),
             'products': SubscriptionProductDao.get_all(),
             'extra_sub_categories': ExtraSubscriptionCategoryDao.categories_for_depot_list_ordered(),
-            'depots': DepotDao.all_depots_order_by_code(),
+            'depots': DepotDao.all_depots_order_by_code().select_related('contact'),
             'weekdays': {weekdays[weekday['weekday']]: weekday['weekday'] for weekday in
                          DepotDao.distinct_weekdays()},
-            'messages': ListMessageDao.all_active()
+            'messages': list(ListMessageDao.all_active())
         }
+        depot_dict.update(depot_list_matrix(depot_dict['subscriptions'], depot_dict['products'],
+                                            depot_dict['extra_sub_categories'], depot_dict['depots']))
 
-        render_to_pdf_storage('exports/depotlist.html',
-                              depot_dict, 'depotlist.pdf')
-        render_to_pdf_storage('exports/depot_overview.html',
-                              depot_dict, 'depot_overview.pdf')
-        render_to_pdf_storage('exports/amount_overview.html',
-                              depot_dict, 'amount_overview.pdf')
+        generate_depot_list_pdfs(depot_dict, options['processes'], options['rerender'])
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from juntagrico.util.testdata import generate_dataset
+
+
+class Command(BaseCommand):
+    help = 'Generate a large synthetic dataset offline with bulk inserts, e.g. for benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--members', type=int, default=1000, help='number of members to create')
+        parser.add_argument('--depots', type=int, default=20, help='number of depots to create')
+        parser.add_argument('--jobs', type=int, default=500, help='number of jobs to create')
+        parser.add_argument('--assignments', type=int, default=10000, help='number of assignments to create')
+        parser.add_argument('--seed', type=int, default=0, help='seed of the random generator')
+        parser.add_argument('--password', default='12345', help='password of all created users')
+
+    # entry point used by manage.py
+    def handle(self, *args, **options):
+        if options['members'] < 1:
+            raise CommandError('at least one member is needed')
+        start = time.perf_counter()
+        counts = generate_dataset(options['members'], options['depots'], options['jobs'], options['assignments'],
+                                  options['seed'], options['password'])
+        self.stdout.write(', '.join('{} {}'.format(amount, name) for name, amount in counts.items()) +
+                          ' created in {:.1f}s'.format(time.perf_counter() - start))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from juntagrico.util.menu import cache_is_shared, menu_cache_stats, reset_menu_cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Show the hits, misses and the hit rate of the menu cache since the counters were last reset'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='reset the counters after showing them')
+
+    # entry point used by manage.py
+    def handle(self, *args, **options):
+        if not cache_is_shared():
+            self.stderr.write('the local memory cache is not shared between processes, '
+                              'the counters of the web server processes cannot be shown')
+        stats = menu_cache_stats()
+        self.stdout.write('hits: {hits}, misses: {misses}, hit rate: {hit_rate:.1%}'.format(**stats))
+        if options['reset']:
+            reset_menu_cache_stats()
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from juntagrico.dao.assignmentdao import AssignmentDao
+
+
+class Command(BaseCommand):
+    help = 'Recount the occupied slots of all jobs, e.g. after assignments were changed without running the signals'
+
+    # entry point used by manage.py
+    def handle(self, *args, **options):
+        count = AssignmentDao.update_occupied_slots()
+        self.stdout.write('occupied slots of {} jobs updated'.format(count))
@@ -1,27 +1,64 @@
 import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from django.core.management.base import BaseCommand
+from django.db import connections
 from django.utils import timezone
 
-from juntagrico.dao.assignmentdao import AssignmentDao
 from juntagrico.dao.jobdao import JobDao
-from juntagrico.mailer import membernotification
+from juntagrico.entity.jobs import Job
+from juntagrico.mailer import membernotification, open_mailer_connection
 
 
 class Command(BaseCommand):
 
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=1,
+                            help='number of threads sending the reminders concurrently, each over its own connection. '
+                                 'only use it with a thread safe mailer')
+
     # entry point used by manage.py
     def handle(self, *args, **options):
         now = timezone.now()
         end = now + datetime.timedelta(days=2)
-        for job in JobDao.jobs_to_remind(now, end):
-            participants = []
-            emails = []
-            for assignment in AssignmentDao.assignments_for_job(job.id):
-                if assignment.member is not None:
-                    participants.append(str(assignment.member))
-                    emails.append(assignment.member.email)
-            membernotification.job_reminder(emails, job, ', '.join(participants))
-            job.reminder_sent = True
-            job.save()
-            print(('reminder sent for job ' + str(job.id)))
+        jobs = JobDao.jobs_to_remind_with_participants(now, end)
+        local = threading.local()
+        mail_connections = []
+
+        def remind(job):
+            # connections are not thread safe, so every thread opens its own and reuses it for all its reminders.
+            # mailers which do not send themselves, like the outbox mailer, provide no connection
+            if not hasattr(local, 'connection'):
+                local.connection = open_mailer_connection()
+                if local.connection is not None:
+                    mail_connections.append(local.connection)
+            members = [assignment.member for assignment in job.assignment_set.all() if assignment.member is not None]
+            try:
+                membernotification.job_reminder([member.email for member in members], job,
+                                                ', '.join(str(member) for member in members), local.connection)
+            except Exception as e:
+                self.stderr.write('reminder for job ' + str(job.id) + ' failed: ' + str(e))
+                return None
+            return job.id
+
+        def remind_in_worker(job):
+            try:
+                return remind(job)
+            finally:
+                # every worker thread opens its own database connection, which would stay open otherwise
+                connections.close_all()
+
+        try:
+            if options['workers'] > 1:
+                with ThreadPoolExecutor(options['workers']) as executor:
+                    reminded = list(executor.map(remind_in_worker, jobs))
+            else:
+                reminded = [remind(job) for job in jobs]
+        finally:
+            for connection in mail_connections:
+                connection.close()
+        reminded = [job_id for job_id in reminded if job_id is not None]
+        Job.objects.filter(id__in=reminded).update(reminder_sent=True)
+        for job_id in reminded:
+            self.stdout.write('reminder sent for job ' + str(job_id))
@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from juntagrico.util.outboxmailer import send_outbox
+
+
+class Command(BaseCommand):
+    help = 'Deliver the emails stored in the outbox by the outbox mailer'
+
+    def add_arguments(self, parser):
+
+        # Named (optional) arguments
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            dest='batch_size',
+            default=100,
+            help='number of emails sent over one connection',
+        )
+        # Named (optional) arguments
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            dest='max_attempts',
+            default=5,
+            help='number of attempts before an email is marked as failed',
+        )
+        # Named (optional) arguments
+        parser.add_argument(
+            '--retry-delay',
+            type=int,
+            dest='retry_delay',
+            default=300,
+            help='seconds to wait before the first retry, doubled after each attempt',
+        )
+        # Named (optional) arguments
+        parser.add_argument(
+            '--pause',
+            type=float,
+            dest='pause',
+            default=0,
+            help='seconds to wait between two batches, to respect the rate limit of the mail server',
+        )
+        # Named (optional) arguments
+        parser.add_argument(
+            '--interval',
+            type=int,
+            dest='interval',
+            default=0,
+            help='keep running and check the outbox every interval seconds',
+        )
+
+    # entry point used by manage.py
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = send_outbox(options['batch_size'], options['max_attempts'], options['retry_delay'],
+                                       options['pause'])
+            if sent or failed:
+                self.stdout.write('{} emails sent, {} failed'.format(sent, failed))
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,18 @@
+# Generated by Django 3.0.7 on 2026-10-16 22:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('juntagrico', '0021_auto_20200414_2150'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='time',
+            field=models.DateTimeField(db_index=True, verbose_name='Zeitpunkt'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.0.7 on 2026-10-16 23:00
+
+from django.db import migrations, models
+import django.utils.timezone
+import juntagrico.entity
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('juntagrico', '0022_auto_20261016_1747'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEmail',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.TextField(verbose_name='Betreff')),
+                ('recipients', models.TextField(verbose_name='Empfänger')),
+                ('message', models.BinaryField()),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Erstellt')),
+                ('next_attempt', models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='Nächster Versuch')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='Versuche')),
+                ('failed', models.BooleanField(default=False, verbose_name='Fehlgeschlagen')),
+                ('last_error', models.TextField(blank=True, default='', verbose_name='Letzter Fehler')),
+            ],
+            options={
+                'verbose_name': 'Ausstehende E-Mail',
+                'verbose_name_plural': 'Ausstehende E-Mails',
+            },
+            bases=(models.Model, juntagrico.entity.OldHolder),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.0.7 on 2026-10-16 23:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('juntagrico', '0023_outboxemail'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tfsst',
+            index=models.Index(fields=['subscription', 'type'], name='juntagrico__subscri_f93c0a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tsst',
+            index=models.Index(fields=['subscription', 'type'], name='juntagrico__subscri_58280b_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.0.7 on 2026-10-16 23:53
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+class Migration(migrations.Migration):
+
+    def countOccupiedSlots(apps, schema_editor):
+        Job = apps.get_model('juntagrico', 'Job')
+        Assignment = apps.get_model('juntagrico', 'Assignment')
+        counts = Assignment.objects.filter(job=OuterRef('pk')).order_by().values('job')\
+            .annotate(count=Count('id')).values('count')
+        Job.objects.update(occupied_slots=Coalesce(Subquery(counts), 0))
+
+    dependencies = [
+        ('juntagrico', '0024_type_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='occupied_slots',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False, verbose_name='Besetzte Plätze'),
+        ),
+        migrations.RunPython(countOccupiedSlots, migrations.RunPython.noop),
+    ]
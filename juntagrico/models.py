@@ -3,11 +3,14 @@ from django.db.models import signals
 from django.utils.translation import gettext as _
 
 import juntagrico
-from juntagrico.entity.extrasubs import ExtraSubscription
-from juntagrico.entity.jobs import Assignment, OneTimeJob, RecuringJob, Job
+from juntagrico.entity.delivery import Delivery
+from juntagrico.entity.depot import Depot
+from juntagrico.entity.extrasubs import ExtraSubscription, ExtraSubscriptionCategory
+from juntagrico.entity.jobs import Assignment, OneTimeJob, RecuringJob, Job, ActivityArea, JobExtra, JobType
 from juntagrico.entity.member import Member
 from juntagrico.entity.share import Share
 from juntagrico.entity.subs import Subscription
+from juntagrico.entity.subtypes import SubscriptionSize, SubscriptionType, TFSST, TSST
 from juntagrico.lifecycle.extrasub import extra_sub_pre_save, handle_extra_sub_deactivated, handle_extra_sub_activated
 from juntagrico.lifecycle.job import job_pre_save, handle_job_canceled, handle_job_time_changed
 from juntagrico.lifecycle.member import member_pre_save, member_post_save, handle_member_deactivated, \
@@ -15,6 +18,8 @@ from juntagrico.lifecycle.member import member_pre_save, member_post_save, handl
 from juntagrico.lifecycle.share import share_post_save, handle_share_created, share_pre_save
 from juntagrico.lifecycle.sub import sub_pre_save, handle_sub_canceled, handle_sub_deactivated, handle_sub_activated, \
     sub_post_save, handle_sub_created
+from juntagrico.util.menu import invalidate_menu_cache, assignment_menu_changed, member_menu_changed, \
+    subscription_menu_changed, subscription_types_menu_changed, job_menu_changed
 from juntagrico.util.signals import register_entities_for_post_init_and_save
 
 
@@ -35,6 +40,24 @@ class SpecialRoles(models.Model):
 signals.post_save.connect(Member.create, sender=Member)
 signals.post_delete.connect(Member.post_delete, sender=Member)
 signals.pre_save.connect(Assignment.pre_save, sender=Assignment)
+signals.post_save.connect(Assignment.post_save, sender=Assignment)
+signals.post_delete.connect(Assignment.post_delete, sender=Assignment)
+for job_model in [Job, OneTimeJob, RecuringJob]:
+    signals.post_save.connect(Job.post_save, sender=job_model)
+signals.post_save.connect(TSST.reset_subscription_types_memo, sender=TSST)
+signals.post_delete.connect(TSST.reset_subscription_types_memo, sender=TSST)
+''' menu cache invalidation '''
+# queryset updates and bulk inserts of these models send no signals and invalidate the cache explicitly
+menu_handlers = [(assignment_menu_changed, [Assignment]), (member_menu_changed, [Member]),
+                 (subscription_menu_changed, [Subscription]), (subscription_types_menu_changed, [TSST, TFSST]),
+                 (job_menu_changed, [OneTimeJob, RecuringJob]),
+                 # shown in the menus of many members
+                 (invalidate_menu_cache, [SubscriptionType, SubscriptionSize, ActivityArea, Depot, JobType, JobExtra,
+                                          ExtraSubscriptionCategory, Delivery])]
+for menu_handler, menu_models in menu_handlers:
+    for menu_model in menu_models:
+        signals.post_save.connect(menu_handler, sender=menu_model)
+        signals.post_delete.connect(menu_handler, sender=menu_model)
 ''' lifecycle signal handling'''
 ''' job signal handling '''
 signals.pre_save.connect(job_pre_save, sender=OneTimeJob)
@@ -0,0 +1,51 @@
+/*global define, jobs_data_url*/
+define([], function () {
+
+    $("#filter-table thead th.table-search").each(function () {
+        var title = $(this).text();
+        $(this).append("<input type='text' placeholder='' style='width: 100%;' class='form-control input-sm' />");
+    });
+
+    var columns = [];
+    $("#filter-table thead th").each(function () {
+        var column = $(this).data("column");
+        columns.push({
+            "data": column || null,
+            "className": column ? "" : "details-control",
+            "defaultContent": "",
+            "orderable": column === "date"
+        });
+    });
+
+    var table = $("#filter-table").DataTable({
+        "serverSide": true,
+        "ajax": {
+            "url": jobs_data_url,
+            "data": function (data) {
+                data.area = $("#job-area").val();
+            }
+        },
+        "columns": columns,
+        "order": [[columns.findIndex(function (column) { return column.data === "date"; }), "asc"]],
+        "pageLength": 100,
+        "lengthChange": false,
+        "search": {
+            "smart": false
+        },
+        "language": {
+            "search": "Suchen: "
+        }
+    });
+    decorate_man_list_inputs();
+
+    $("#job-area").change(function () {
+        table.draw();
+    });
+
+    align_filter();
+
+    table_column_search(table);
+
+    job_collapsible(table);
+
+});
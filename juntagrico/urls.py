@@ -14,6 +14,7 @@ urlpatterns = [
     path('my/newpassword', juntagrico.new_password, name='new-password'),
     path('my/jobs', juntagrico.jobs, name='jobs'),  #
     path('my/jobs/all', juntagrico.all_jobs, name='jobs-all'),  #
+    path('my/jobs/all/data', juntagrico.all_jobs_data, name='jobs-all-data'),
     path('my/jobs/<int:job_id>/', juntagrico.job, name='job'),  #
     path('my/profile', juntagrico.profile, name='profile'),  #
     path('my/cancel/membership', juntagrico.cancel_membership, name='cancel-membership'),  #
@@ -54,6 +55,8 @@ urlpatterns = [
          name='sub-activate'),  #
     path('my/subscription/deactivate/<int:subscription_id>/', juntagrico_subscription.deactivate_subscription,
          name='sub-deactivate'),  #
+    path('my/subscriptions/activate', juntagrico_subscription.activate_subscriptions, name='subs-activate'),
+    path('my/subscriptions/deactivate', juntagrico_subscription.deactivate_subscriptions, name='subs-deactivate'),
     path('my/subscription/cancel/<int:subscription_id>/', juntagrico_subscription.cancel_subscription,
          name='sub-cancel'),
     path('my/subscription/leave/<int:subscription_id>/', juntagrico_subscription.leave_subscription,
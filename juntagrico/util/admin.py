@@ -1,11 +1,14 @@
 from django import forms
 from django.contrib import admin
+from django.db.models import Case, F, IntegerField, Value, When
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.html import format_html
+from django.utils.translation import gettext as _
 
 from juntagrico.entity.jobs import OneTimeJob, RecuringJob
+from juntagrico.util import management
 
 
 def formfield_for_coordinator(request, target, field_name, perm, query_function, **kwargs):
@@ -36,6 +39,29 @@ def extra_context_for_past_jobs(request, job_type, object_id, extra_context):
     return extra_context
 
 
+def free_slots(job):
+    return job.free_slots
+
+
+free_slots.short_description = _('Freie Plätze')
+# the property of the job cannot be sorted by the changelist, this sorts by the occupied_slots counter.
+# jobs with infinite slots have the most free slots
+free_slots.admin_order_field = Case(When(infinite_slots=True, then=Value(2 ** 31 - 1)),
+                                    default=F('slots') - F('occupied_slots'), output_field=IntegerField())
+
+
+def cancel_jobs(modeladmin, request, queryset):
+    if not (request.user.is_superuser or request.user.has_perm('juntagrico.can_edit_past_jobs')):
+        # like in the change view, started jobs can only be changed with the permission
+        queryset = queryset.filter(time__gte=timezone.now())
+    count = management.cancel_jobs(queryset)
+    modeladmin.message_user(request, _('{} Jobs abgesagt').format(count))
+
+
+cancel_jobs.short_description = _('Jobs absagen')
+cancel_jobs.allowed_permissions = ('change',)
+
+
 class MyHTMLWidget(forms.widgets.Widget):
     '''
     Widget that display (non-editably) arbitrary html.
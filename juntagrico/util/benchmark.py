@@ -0,0 +1,149 @@
+import statistics
+import tempfile
+from contextlib import contextmanager
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import transaction
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from juntagrico.entity.jobs import Job
+from juntagrico.entity.member import Member
+from juntagrico.entity.subs import Subscription
+from juntagrico.util.menu import invalidate_member_menus
+from juntagrico.util.profiling import RequestProfile
+
+BENCHMARK_EMAIL = 'benchmark@testdata.juntagrico'
+
+VIEWS = ['home', 'job', 'jobs-all', 'filters', 'filter-subs', 'future', 'sub-mgmt-changelist',
+         'export-membersfilter', 'export-members', 'export-shares']
+TARGETS = VIEWS + ['generate_depot_list']
+
+
+@contextmanager
+def benchmark_sandbox():
+    '''
+    everything written to the database inside is rolled back and the files are stored in a temporary directory,
+    so that neither the generated data nor the depot lists of the benchmark replace the real ones
+    '''
+    with tempfile.TemporaryDirectory() as media_root:
+        with override_settings(DEFAULT_FILE_STORAGE='django.core.files.storage.FileSystemStorage', MEDIA_ROOT=media_root):
+            try:
+                with transaction.atomic():
+                    try:
+                        yield
+                    finally:
+                        transaction.set_rollback(True)
+            finally:
+                # the cache may contain data of the rolled back transaction
+                cache.clear()
+
+
+def benchmark_member():
+    '''
+    the superuser member the views are requested with. it is created if needed and joins an active subscription,
+    so that the member specific parts of the pages are rendered as well
+    '''
+    member = Member.objects.filter(email=BENCHMARK_EMAIL).select_related('user').first()
+    if member is None:
+        user = User.objects.create_superuser('juntagrico_benchmark', BENCHMARK_EMAIL, None)
+        member = Member.objects.create(user=user, first_name='Bench', last_name='Mark', email=BENCHMARK_EMAIL,
+                                       addr_street='Benchmarkstrasse 1', addr_zipcode='8000', addr_location='Zürich',
+                                       phone='000', confirmed=True)
+    if member.subscription_id is None:
+        subscription = Subscription.objects.filter(active=True, canceled=False).order_by('id').first()
+        if subscription is not None:
+            # a bulk update does not run the lifecycle handlers, the member is only a co member for the benchmark
+            Member.objects.filter(pk=member.pk).update(subscription=subscription)
+            invalidate_member_menus([member.pk], [subscription.pk])
+    return member
+
+
+def _busiest_job():
+    return Job.objects.annotate(assignment_count=Count('assignment')).order_by('-assignment_count', 'id').first()
+
+
+def _view_target(client, name, url):
+    def run():
+        response = client.get(url)
+        if response.streaming:
+            b''.join(response.streaming_content)
+        if response.status_code != 200:
+            raise RuntimeError('{} ({}) returned status {}'.format(name, url, response.status_code))
+    return run
+
+
+def _depot_list_target():
+    def run():
+        call_command('generate_depot_list', force=True, rerender=True, stdout=StringIO())
+    return run
+
+
+def benchmark_targets(names=None):
+    '''
+    returns a dict of the benchmarked names and callables running them once
+    '''
+    names = names or TARGETS
+    client = Client()
+    client.force_login(benchmark_member().user)
+    job = _busiest_job()
+    targets = {}
+    for name in names:
+        if name == 'generate_depot_list':
+            targets[name] = _depot_list_target()
+        elif name == 'job':
+            if job is None:
+                continue
+            targets[name] = _view_target(client, name, reverse(name, args=[job.pk]))
+        else:
+            targets[name] = _view_target(client, name, reverse(name))
+    return targets
+
+
+def run_benchmark(names=None, repeat=3):
+    '''
+    run every target repeat times with a cold cache and return per target the number of queries,
+    the median and minimum total time as well as the median sql and template time, all in seconds
+    '''
+    results = {}
+    for name, target in benchmark_targets(names).items():
+        profiles = []
+        for i in range(repeat):
+            cache.clear()
+            with RequestProfile() as profile:
+                target()
+            profiles.append(profile)
+        total_times = [profile.total_time for profile in profiles]
+        results[name] = {
+            'queries': max(profile.query_count for profile in profiles),
+            'median': round(statistics.median(total_times), 6),
+            'min': round(min(total_times), 6),
+            'sql_time': round(statistics.median(profile.sql_time for profile in profiles), 6),
+            'template_time': round(statistics.median(profile.template_time for profile in profiles), 6),
+        }
+    return results
+
+
+def format_report(results, baseline=None):
+    '''
+    format the results as table. if a baseline of an earlier run is given, the changes of the queries
+    and of the median time are added
+    '''
+    header = '{:<22} {:>8} {:>10} {:>10} {:>10} {:>10}'.format('target', 'queries', 'median', 'min', 'sql', 'templates')
+    if baseline:
+        header += ' {:>10} {:>9}'.format('Δ queries', 'Δ median')
+    lines = [header, '-' * len(header)]
+    for name, result in results.items():
+        line = '{:<22} {:>8} {:>9.1f}ms {:>8.1f}ms {:>8.1f}ms {:>8.1f}ms'.format(
+            name, result['queries'], result['median'] * 1000, result['min'] * 1000, result['sql_time'] * 1000,
+            result['template_time'] * 1000)
+        if baseline and name in baseline:
+            before = baseline[name]
+            change = (result['median'] - before['median']) / before['median'] * 100 if before['median'] else 0
+            line += ' {:>+10} {:>+8.1f}%'.format(result['queries'] - before['queries'], change)
+        lines.append(line)
+    return '\n'.join(lines)
@@ -1,3 +1,10 @@
+from django.core.mail import get_connection as get_mail_connection
+
+
 class Mailer:
     def send(msg):
         msg.send()
+
+    def get_connection():
+        # connection to reuse for several mails, see juntagrico.mailer.open_mailer_connection
+        return get_mail_connection()
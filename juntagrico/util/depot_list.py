@@ -0,0 +1,153 @@
+import hashlib
+import json
+
+from django.core.files.storage import default_storage
+from django.template.loader import get_template
+
+from juntagrico.config import Config
+from juntagrico.dao.extrasubscriptiondao import ExtraSubscriptionDao
+from juntagrico.dao.memberdao import MemberDao
+from juntagrico.dao.subscriptiontypedao import SubscriptionTypeDao
+from juntagrico.util.pdf import htmls_to_pdfs, merge_pdfs, read_pdf_storage, save_pdf_storage
+
+FRAGMENT_DIR = 'depotlist'
+# templates rendering the pages of one depot, their sources are part of the fragment names
+FRAGMENT_TEMPLATES = ['exports/depotlist.html', 'exports/snippets/snippet_depotlist_header.html',
+                      'exports/snippets/snippet_depotlist_style.css']
+
+
+def _add(totals, amounts):
+    for index, amount in enumerate(amounts):
+        totals[index] += amount
+
+
+def depot_list_matrix(subscriptions, products, categories, depots):
+    '''
+    precalculates all numbers shown on the depot lists with two grouped queries,
+    so that the templates only look them up in plain dicts instead of querying each cell.
+    the amounts are lists containing the sizes of all products followed by the extra subscription types
+    in the order they are shown as columns.
+    '''
+    product_columns = [{'product': product, 'sizes': list(product.sizes_for_depot_list)} for product in products]
+    category_columns = [{'category': category, 'types': list(category.types_for_depot_list)}
+                        for category in categories]
+    columns = {('size', size.pk): index for index, size in
+               enumerate(size for column in product_columns for size in column['sizes'])}
+    offset = len(columns)
+    columns.update({('type', es_type.pk): offset + index for index, es_type in
+                    enumerate(es_type for column in category_columns for es_type in column['types'])})
+
+    subscription_list = list(subscriptions)
+    amounts = {subscription.pk: [0] * len(columns) for subscription in subscription_list}
+    units = {subscription.pk: 0 for subscription in subscription_list}
+    for row in SubscriptionTypeDao.size_amounts_by_subscription(subscriptions):
+        units[row['subscription']] += row['type__size__units'] * row['amount']
+        index = columns.get(('size', row['type__size']))
+        if index is not None:
+            amounts[row['subscription']][index] += row['amount']
+    for row in ExtraSubscriptionDao.active_type_amounts_by_subscription(subscriptions):
+        index = columns.get(('type', row['type']))
+        if index is not None:
+            amounts[row['main_subscription']][index] += row['amount']
+    # the recipients of active subscriptions are their current members
+    recipients = {subscription.pk: [] for subscription in subscription_list}
+    for member in MemberDao.active_members_for_subscriptions(subscriptions).order_by('pk'):
+        recipients[member.subscription_id].append(str(member))
+
+    depots = list(depots)
+    depot_subscriptions = {depot.pk: [] for depot in depots}
+    depot_totals = {depot.pk: [0] * len(columns) for depot in depots}
+    weekday_depots = {}
+    weekday_totals = {}
+    weekday_units = {}
+    for depot in depots:
+        weekday_depots.setdefault(depot.weekday, []).append(depot)
+        weekday_totals.setdefault(depot.weekday, [0] * len(columns))
+        weekday_units.setdefault(depot.weekday, 0)
+    depot_weekdays = {depot.pk: depot.weekday for depot in depots}
+    totals = [0] * len(columns)
+    total_units = 0
+    for subscription in subscription_list:
+        sub_amounts = amounts[subscription.pk]
+        weekday = depot_weekdays[subscription.depot_id]
+        depot_subscriptions[subscription.depot_id].append({
+            'subscription': subscription,
+            'recipients_names': ', '.join(recipients[subscription.pk]),
+            'amounts': sub_amounts
+        })
+        _add(depot_totals[subscription.depot_id], sub_amounts)
+        _add(weekday_totals[weekday], sub_amounts)
+        _add(totals, sub_amounts)
+        weekday_units[weekday] += units[subscription.pk]
+        total_units += units[subscription.pk]
+
+    return {
+        'product_columns': product_columns,
+        'category_columns': category_columns,
+        'depot_subscriptions': depot_subscriptions,
+        'depot_totals': depot_totals,
+        'weekday_depots': weekday_depots,
+        'weekday_totals': weekday_totals,
+        'weekday_units': weekday_units,
+        'totals': totals,
+        'total_units': total_units,
+    }
+
+
+def depot_fragment_name(depot, depot_dict, template_sources):
+    '''
+    storage name of the pdf fragment of one depot on the depot list.
+    it contains a hash of everything shown on the depots pages, so it changes as soon as the fragment is outdated
+    '''
+    contact = depot.contact
+    data = {
+        'templates': template_sources,
+        'vocabulary': Config.vocabulary('depot'),
+        'depot': [depot.name, depot.weekday, depot.addr_street, depot.addr_zipcode, depot.addr_location,
+                  contact.first_name, contact.last_name],
+        'products': [[column['product'].name, column['product'].description, [size.name for size in column['sizes']]]
+                     for column in depot_dict['product_columns']],
+        'categories': [[column['category'].name, column['category'].description, [t.size for t in column['types']]]
+                       for column in depot_dict['category_columns']],
+        'subscriptions': [[row['recipients_names'], row['amounts']] for row in depot_dict['depot_subscriptions'][depot.pk]],
+        'totals': depot_dict['depot_totals'][depot.pk],
+        'messages': [str(message) for message in depot_dict['messages']],
+    }
+    digest = hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+    return '{}/{}-{}.pdf'.format(FRAGMENT_DIR, depot.pk, digest)
+
+
+def _delete_outdated_fragments(fragment_names):
+    if not default_storage.exists(FRAGMENT_DIR):
+        return
+    for filename in default_storage.listdir(FRAGMENT_DIR)[1]:
+        name = '{}/{}'.format(FRAGMENT_DIR, filename)
+        if name not in fragment_names:
+            default_storage.delete(name)
+
+
+def generate_depot_list_pdfs(depot_dict, processes=None, rerender=False):
+    '''
+    render the depot list, depot overview and amount overview pdfs into the storage.
+    the depot list is concatenated from a cover page with the creation time and per depot fragments,
+    which are only rendered again if the depots data changed.
+    all rendering to pdf happens in parallel, see htmls_to_pdfs
+    '''
+    depotlist = get_template('exports/depotlist.html')
+    template_sources = [get_template(name).template.source for name in FRAGMENT_TEMPLATES]
+    fragments = {depot: depot_fragment_name(depot, depot_dict, template_sources) for depot in depot_dict['depots']}
+    outdated = [depot for depot, name in fragments.items() if rerender or not default_storage.exists(name)]
+
+    htmls = [get_template('exports/depot_overview.html').render(depot_dict),
+             get_template('exports/amount_overview.html').render(depot_dict),
+             get_template('exports/depotlist_cover.html').render(depot_dict)]
+    htmls += [depotlist.render(dict(depot_dict, depots=[depot])) for depot in outdated]
+    pdfs = htmls_to_pdfs(htmls, processes)
+
+    save_pdf_storage(pdfs[0], 'depot_overview.pdf')
+    save_pdf_storage(pdfs[1], 'amount_overview.pdf')
+    for depot, pdf in zip(outdated, pdfs[3:]):
+        save_pdf_storage(pdf, fragments[depot])
+    save_pdf_storage(merge_pdfs([pdfs[2]] + [read_pdf_storage(name) for name in fragments.values()]), 'depotlist.pdf')
+    _delete_outdated_fragments(fragments.values())
+    return len(outdated)
@@ -1,7 +1,14 @@
+import datetime
 import math
 
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import format_html
 from django.utils.translation import gettext as _
 
+from juntagrico.config import Config
+from juntagrico.util.temporal import weekday_short
+
 
 def get_status_image(percent=0):
     status_number = min(100, int(25 * math.floor(float(percent) / 25)))
@@ -19,3 +26,162 @@ def get_status_image_text(percent=0):
     }
     status_number = min(100, int(25 * math.floor(float(percent) / 25)))
     return texts[status_number]
+
+
+def job_series_dates(start, end, weekdays, interval=7):
+    '''
+    the dates from start to end (both included) on the given iso weekdays. with an interval of 14 days
+    only every second week starting with the week of the start date is included
+    '''
+    weekdays = set(int(weekday) for weekday in weekdays)
+    dates = []
+    for delta in range((end - start).days + 1):
+        if delta % interval >= 7:
+            continue
+        date = start + datetime.timedelta(delta)
+        if date.isoweekday() in weekdays:
+            dates.append(date)
+    return dates
+
+
+class JobListEntry:
+    '''
+    Lightweight stand-in for a job in job lists (snippet_jobs.html).
+    Everything it displays is loaded upfront by JobDao.jobs_for_list, other attributes are taken from the job itself.
+    '''
+
+    def __init__(self, job, occupied_places, extras, full_extras):
+        self.job = job
+        self.type = job.type
+        self._occupied_places = occupied_places
+        self._extras = extras
+        self._full_extras = full_extras
+
+    def __getattr__(self, name):
+        if name == 'job':
+            raise AttributeError(name)
+        return getattr(self.job, name)
+
+    def __str__(self):
+        return str(self.job)
+
+    def weekday_name(self):
+        return weekday_short(self.job.time.isoweekday(), 2)
+
+    def start_time(self):
+        return self.job.time
+
+    def end_time(self):
+        return self.job.time + timezone.timedelta(hours=self.type.duration)
+
+    def occupied_places(self):
+        return self._occupied_places
+
+    @property
+    def free_slots(self):
+        if self.job.infinite_slots:
+            return -1
+        if not (self.job.slots is None):
+            return self.job.slots - self._occupied_places
+        return 0
+
+    def get_status_percentage(self):
+        if self.job.slots < 1:
+            return get_status_image(100)
+        return get_status_image(self._occupied_places * 100 / self.job.slots)
+
+    def is_core(self):
+        return self.type.activityarea.core
+
+    @property
+    def get_css_classes(self):
+        result = 'area-' + str(self.type.activityarea.pk)
+        if self.job.canceled:
+            result += ' canceled'
+        return result
+
+    def extras(self):
+        extras_result = []
+        for extra in self._extras:
+            if extra.id in self._full_extras:
+                extras_result.append(extra.extra_type.display_full)
+            else:
+                extras_result.append(extra.extra_type.display_empty)
+        return ' '.join(extras_result)
+
+
+def job_date_text(time, separator=' '):
+    '''
+    weekday and date of a job as shown in the job table, time in the local timezone
+    '''
+    return '{}{}{}'.format(weekday_short(time.isoweekday(), 2), separator, time.strftime('%d.%m.%Y'))
+
+
+def job_days_matching(jobs, text):
+    '''
+    the days of the jobs whose text in the date column of the job table contains the text,
+    so that a weekday or any part of a date like "06.2020" can be searched
+    '''
+    text = text.lower()
+    return [day.date() for day in jobs.datetimes('time', 'day') if text in job_date_text(day).lower()]
+
+
+def job_table_row(job):
+    '''
+    cells of a job in the job table (see snippet_jobs.html) for the DataTables server side processing
+    '''
+    time = timezone.localtime(job.time)
+    status = ''
+    if job.free_slots > -1:
+        status_image = job.get_status_percentage()
+        status = format_html('<img alt="{}: {}" src="{}"/>', _('Status'), status_image, Config.images(status_image))
+    return {
+        'DT_RowData': {
+            'place': job.type.location,
+            'starttime': time.strftime('%H:%M'),
+            'endtime': timezone.localtime(job.end_time()).strftime('%H:%M'),
+            'area': job.type.activityarea.name,
+        },
+        'core': format_html('<img alt="{}" src="{}"/>', _('Kernbereich'), Config.images('core')) if job.is_core() else '',
+        'date': job_date_text(time, '&nbsp;'),
+        'job': format_html('<a href="{}" class="{}">{}</a>', reverse('job', args=[job.id]), job.get_css_classes, job.type.get_name),
+        'status': status,
+        'extras': job.extras(),
+    }
+
+
+class JobDetail(JobListEntry):
+    '''
+    Stand-in for a job on the job detail page (job.html) and for its messages.
+    The assignments with their members and extras and the extras of the job type are loaded upfront by JobDao.job_detail.
+    '''
+
+    def __init__(self, job, assignments, extras):
+        full_extras = {extra.id for assignment in assignments for extra in assignment.job_extras.all()}
+        super().__init__(job, len(assignments), extras, full_extras)
+        self.assignments = assignments
+
+    @property
+    def participants(self):
+        '''
+        the member of every assignment, members with several assignments occur several times
+        '''
+        return [assignment.member for assignment in self.assignments]
+
+    def assignments_by_member(self):
+        '''
+        the participating members with their assignments in the order they signed up
+        '''
+        assignments_by_member = {}
+        for assignment in self.assignments:
+            assignments_by_member.setdefault(assignment.member, []).append(assignment)
+        return assignments_by_member.items()
+
+    def empty_per_job_extras(self):
+        return [extra for extra in self._extras if not extra.per_member and extra.id not in self._full_extras]
+
+    def full_per_job_extras(self):
+        return [extra for extra in self._extras if not extra.per_member and extra.id in self._full_extras]
+
+    def per_member_extras(self):
+        return [extra for extra in self._extras if extra.per_member]
@@ -1,15 +1,26 @@
+import datetime
 import itertools
 import random
 import string
 
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
 from django.utils import timezone
+from django.utils.timezone import get_default_timezone as gdtz
+from django.utils.translation import gettext as _
 
 from juntagrico.config import Config
+from juntagrico.dao.assignmentdao import AssignmentDao
+from juntagrico.dao.extrasubscriptiondao import ExtraSubscriptionDao
+from juntagrico.entity.jobs import Assignment, Job, RecuringJob
 from juntagrico.entity.share import Share
 from juntagrico.entity.subs import Subscription
 from juntagrico.entity.subtypes import TFSST, TSST
 from juntagrico.mailer import adminnotification
 from juntagrico.mailer import membernotification
+from juntagrico.util.menu import invalidate_member_menus
+from juntagrico.util.models import insert_rows
 from juntagrico.util.temporal import next_membership_end_date
 
 
@@ -107,6 +118,9 @@ def replace_subscription_types(subscription, selected_types):
             itertools.chain(*[[through_class(subscription=subscription, type=sub_type)] * amount
                               for sub_type, amount in selected_types.items()])
         )
+    subscription.reset_types_memo()
+    # the bulk inserts send no signals
+    invalidate_member_menus(subscription_ids=[subscription.pk])
 
 
 def cancel_sub(subscription, end_date, message):
@@ -120,6 +134,118 @@ def cancel_sub(subscription, end_date, message):
         subscription.delete()
 
 
+def activate_subscriptions(subscription_ids, activation_date=None):
+    '''
+    activate the waiting subscriptions in one transaction, so either all or none of them are activated.
+    returns the number of activated subscriptions
+    '''
+    with transaction.atomic():
+        subscriptions = list(Subscription.objects.select_for_update().filter(
+            pk__in=subscription_ids, active=False, deactivation_date=None))
+        for subscription in subscriptions:
+            subscription.active = True
+            subscription.activation_date = activation_date
+            subscription.save()
+    return len(subscriptions)
+
+
+def deactivate_subscriptions(subscription_ids, deactivation_date=None):
+    '''
+    deactivate the active subscriptions and their extra subscriptions in one transaction.
+    returns the number of deactivated subscriptions
+    '''
+    with transaction.atomic():
+        subscriptions = list(Subscription.objects.select_for_update().filter(pk__in=subscription_ids, active=True))
+        extras = ExtraSubscriptionDao.active_extra_subscriptions_for_subscriptions(subscriptions)
+        for subscription in subscriptions:
+            subscription.active = False
+            subscription.deactivation_date = deactivation_date
+            subscription.save()
+        for extra in extras:
+            extra.active = False
+            extra.deactivation_date = deactivation_date
+            extra.save()
+    return len(subscriptions)
+
+
+def sign_up_for_job(job, member, count, extra_type_ids=()):
+    '''
+    create count assignments of the member for the job in one transaction and attach the extras of the job type
+    with the given extra type ids. the job row is locked while the free slots are checked, so concurrent
+    signups cannot overbook the job. raises a ValidationError if the job is canceled, has started or
+    has not enough free slots. returns the created assignments
+    '''
+    if count < 1:
+        raise ValidationError(_('Es muss mindestens eine Person eingetragen werden'), code='invalid')
+    amount = 1
+    if Config.assignment_unit() == 'ENTITY':
+        amount = job.multiplier
+    elif Config.assignment_unit() == 'HOURS':
+        amount = job.multiplier * job.type.duration
+    with transaction.atomic():
+        locked_job = Job.objects.non_polymorphic().select_for_update().get(pk=job.pk)
+        if locked_job.canceled:
+            raise ValidationError(_('Der Einsatz wurde abgesagt'), code='invalid')
+        if locked_job.time < timezone.now():
+            raise ValidationError(_('Der Einsatz hat bereits begonnen'), code='invalid')
+        if not locked_job.infinite_slots:
+            free_slots = locked_job.slots - locked_job.occupied_slots
+            if count > free_slots:
+                raise ValidationError(_('Für den Einsatz sind nur noch {} Plätze frei').format(max(free_slots, 0)),
+                                      code='invalid')
+        core = job.is_core()
+        assignments = [Assignment(member=member, job=job, amount=amount, core_cache=core) for i in range(count)]
+        # the last assignment carries the extras, it is saved on its own to know its id on every database
+        # and to run the save signals once, which also recount the occupied slots including the bulk created ones
+        Assignment.objects.bulk_create(assignments[:-1])
+        assignments[-1].save()
+        extras = job.type.job_extras_set.filter(extra_type__id__in=extra_type_ids)
+        assignments[-1].job_extras.add(*extras)
+    job.occupied_slots = locked_job.occupied_slots + count
+    return assignments
+
+
+def create_job_series(job_type, dates, time, slots, multiplier=1):
+    '''
+    create a recuring job of the job type at the time on each of the dates in one transaction.
+    on databases returning the keys of bulk inserts they are inserted in batches and the save signals are not run,
+    as they only handle changes of existing jobs. returns the ids of the created jobs in the order of the dates
+    '''
+    ctype = ContentType.objects.get_for_model(RecuringJob, for_concrete_model=False)
+    times = [gdtz().localize(datetime.datetime.combine(date, time)) for date in dates]
+    with transaction.atomic():
+        if connection.features.can_return_rows_from_bulk_insert:
+            jobs = [Job(polymorphic_ctype=ctype, slots=slots, multiplier=multiplier, time=job_time) for job_time in times]
+            Job.objects.non_polymorphic().bulk_create(jobs)
+            insert_rows(RecuringJob, [{'job_ptr_id': job.pk, 'type_id': job_type.pk} for job in jobs])
+        else:
+            # the keys of the new rows can not be determined reliably after a bulk insert while other jobs
+            # are created concurrently. saving them one by one is cheap for a series of a few dozen jobs
+            jobs = [RecuringJob.objects.create(type=job_type, slots=slots, multiplier=multiplier, time=job_time)
+                    for job_time in times]
+    return [job.pk for job in jobs]
+
+
+def cancel_jobs(jobs):
+    '''
+    cancel the jobs of the queryset which are not canceled yet with a fixed number of queries.
+    their assignments are deleted and the assigned members are notified once the jobs are canceled.
+    the job_canceled signal is not sent. returns the number of canceled jobs
+    '''
+    with transaction.atomic():
+        job_ids = list(Job.objects.non_polymorphic().select_for_update().filter(pk__in=jobs.values('pk'), canceled=False)
+                       .values_list('id', flat=True))
+        emails = AssignmentDao.member_emails_by_job(job_ids)
+        member_ids, subscription_ids = AssignmentDao.participants_by_jobs(job_ids)
+        AssignmentDao.delete_assignments_for_jobs(job_ids)
+        Job.objects.filter(pk__in=job_ids).update(canceled=True, slots=0)
+        # the assignments are deleted without invalidating the menus of their members one by one
+        invalidate_member_menus(member_ids, subscription_ids)
+    for job in Job.objects.filter(pk__in=emails.keys()):
+        membernotification.job_canceled(emails[job.id], job)
+    return len(job_ids)
+
+
 def cancel_extra_sub(extra):
     if extra.active is True:
         extra.canceled = True
@@ -0,0 +1,197 @@
+import logging
+import time
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+from juntagrico.config import Config
+from juntagrico.dao.activityareadao import ActivityAreaDao
+from juntagrico.dao.assignmentdao import AssignmentDao
+from juntagrico.dao.deliverydao import DeliveryDao
+from juntagrico.dao.depotdao import DepotDao
+from juntagrico.dao.extrasubscriptioncategorydao import ExtraSubscriptionCategoryDao
+from juntagrico.dao.jobdao import JobDao
+from juntagrico.dao.jobextradao import JobExtraDao
+
+log = logging.getLogger('juntagrico.menu')
+
+VERSION_KEY = 'juntagrico.menu.version'
+MEMBER_VERSION_KEY = 'juntagrico.menu.version.member.{}'
+SUBSCRIPTION_VERSION_KEY = 'juntagrico.menu.version.subscription.{}'
+HITS_KEY = 'juntagrico.menu.hits'
+MISSES_KEY = 'juntagrico.menu.misses'
+
+
+def _increment(key):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # key does not exist (yet or anymore)
+        cache.add(key, 1, None)
+        return 1
+
+
+def cache_is_shared():
+    '''
+    the local memory cache only exists in one process. with several worker processes the invalidations
+    and statistics of one worker do not reach the others
+    '''
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], LocMemCache)
+
+
+_backend_checked = False
+
+
+def _check_backend():
+    global _backend_checked
+    if not _backend_checked:
+        _backend_checked = True
+        if not cache_is_shared():
+            log.warning('the menu cache uses the local memory cache. with several worker processes menus can be '
+                        'outdated for up to MENU_CACHE_TIMEOUT seconds, configure a shared cache backend in CACHES')
+
+
+def _versions(keys):
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # start from a fresh value, so entries written before the key was evicted are never matched
+            cache.add(key, int(time.time() * 1000), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def _bump(keys):
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            # key does not exist (yet or anymore)
+            cache.add(key, int(time.time() * 1000), None)
+
+
+def invalidate_menu_cache(sender=None, **kwargs):
+    '''
+    signal handler discarding the cached menu contexts of all members.
+    only used for data shown in the menus of many members
+    '''
+    _bump([VERSION_KEY])
+
+
+def invalidate_member_menus(member_ids=(), subscription_ids=()):
+    '''
+    discard the cached menu contexts of the given members and of all members of the given subscriptions
+    '''
+    keys = [MEMBER_VERSION_KEY.format(member_id) for member_id in member_ids if member_id is not None]
+    keys += [SUBSCRIPTION_VERSION_KEY.format(sub_id) for sub_id in subscription_ids if sub_id is not None]
+    _bump(keys)
+
+
+def assignment_menu_changed(sender, instance, **kwargs):
+    '''
+    the assignment counts of the member and its partners and the next jobs of the member change
+    '''
+    if AssignmentDao.slot_recount_is_suspended():
+        # bulk changes invalidate the menus themselves
+        return
+    invalidate_member_menus([instance.member_id], [instance.member.subscription_id])
+
+
+def member_menu_changed(sender, instance, **kwargs):
+    '''
+    the partners of the member in its previous and current subscription see different assignment counts
+    '''
+    old_subscription_id = (instance._old or {}).get('subscription_id')
+    invalidate_member_menus([instance.pk], [instance.subscription_id, old_subscription_id])
+
+
+def subscription_menu_changed(sender, instance, **kwargs):
+    invalidate_member_menus(subscription_ids=[instance.pk])
+
+
+def subscription_types_menu_changed(sender, instance, **kwargs):
+    invalidate_member_menus(subscription_ids=[instance.subscription_id])
+
+
+def job_menu_changed(sender, instance, **kwargs):
+    '''
+    the job is shown in the next jobs of its participants and counted for them and their partners
+    '''
+    invalidate_member_menus(*AssignmentDao.participants_by_jobs([instance.pk]))
+
+
+def menu_cache_stats():
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': hits / total if total > 0 else 0.0,
+    }
+
+
+def reset_menu_cache_stats():
+    cache.delete_many([HITS_KEY, MISSES_KEY])
+
+
+def calculate_menu_context(member):
+    '''
+    member specific part of the menu. everything in here must only depend on data whose changes invalidate the cache
+    '''
+    required_assignments = 0
+    userassignments_total = 0
+    userassignemnts_core = 0
+    partner_assignments_total = 0
+    partner_assignments_core = 0
+    if member.subscription is not None:
+        required_assignments = member.subscription.required_assignments
+        for amounts in AssignmentDao.assignment_amounts_for_member_and_partners_current_business_year(member):
+            if amounts['member'] == member.pk:
+                userassignments_total = int(amounts['amount_sum'] or 0)
+                userassignemnts_core = int(amounts['core_amount_sum'] or 0)
+            else:
+                partner_assignments_total += amounts['amount_sum'] or 0
+                partner_assignments_core += amounts['core_amount_sum'] or 0
+    partner_assignments_total = int(partner_assignments_total)
+    partner_assignments_core = int(partner_assignments_core)
+    assignmentsrange = list(range(
+        0, max(required_assignments, userassignments_total + partner_assignments_total)))
+
+    return {
+        'assignmentsrange': assignmentsrange,
+        'userassignments_bound': userassignments_total,
+        'userassignemnts_core_bound': userassignemnts_core,
+        'partner_assignments_bound': userassignments_total + partner_assignments_total,
+        'partner_assignments_core_bound': userassignments_total + partner_assignments_core,
+        'next_jobs': list(JobDao.upcomming_jobs_for_member(member)),
+        'has_extra_subscriptions': ExtraSubscriptionCategoryDao.all_categories_ordered().count() > 0,
+        'depot_admin': list(DepotDao.depots_for_contact(member)),
+        'area_admin': list(ActivityAreaDao.areas_by_coordinator(member)),
+        'show_core': ActivityAreaDao.all_core_areas().count() > 0,
+        'show_extras': JobExtraDao.all_job_extras().count() > 0,
+        'show_deliveries': len(DeliveryDao.deliveries_by_subscription(member.subscription)) > 0,
+    }
+
+
+def get_menu_context(member):
+    '''
+    cached version of calculate_menu_context.
+    the cache is invalidated per member, per subscription or for all members by saving or deleting
+    the models the menu depends on, see juntagrico.models, and otherwise expires after MENU_CACHE_TIMEOUT seconds.
+    '''
+    _check_backend()
+    versions = _versions([VERSION_KEY, MEMBER_VERSION_KEY.format(member.pk),
+                          SUBSCRIPTION_VERSION_KEY.format(member.subscription_id)])
+    # the subscription is part of the key, so a member changing its subscription is never served an outdated entry
+    key = 'juntagrico.menu.{}.{}.{}.{}.{}'.format(member.pk, member.subscription_id, *versions)
+    context = cache.get(key)
+    if context is not None:
+        _increment(HITS_KEY)
+        log.debug('menu cache hit for member %s', member.pk)
+        return context
+    _increment(MISSES_KEY)
+    log.debug('menu cache miss for member %s', member.pk)
+    context = calculate_menu_context(member)
+    cache.set(key, context, Config.menu_cache_timeout())
+    return context
@@ -24,10 +24,13 @@ def home_messages(request):
     return result
 
 
-def job_messages(request, job):
+def job_messages(request, job, participants=None):
+    '''
+    the participants are the members of the assignments of the job and are loaded if they are not given
+    '''
     result = []
     member = request.user.member
-    all_participants = list(MemberDao.members_by_job(job))
+    all_participants = list(MemberDao.members_by_job(job)) if participants is None else participants
     number_of_participants = len(all_participants)
     allowed_additional_participants = list(
         range(1, job.slots - number_of_participants + 1))
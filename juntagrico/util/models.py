@@ -2,6 +2,8 @@
     Copys the user defined attributes of a model into another model.
     It will only copy the fields with are present in both
 '''
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import AutoField
 
 
 def attribute_copy(source, target):
@@ -11,3 +13,34 @@ def attribute_copy(source, target):
            field.attname in source.__dict__ and \
            field.attname in target.__dict__:
             target.__dict__[field.attname] = source.__dict__[field.attname]
+
+
+def insert_rows(model, rows):
+    '''
+    insert rows given as dicts of attribute names and values into the table of the model with executemany,
+    without creating model instances. missing values are filled with the defaults of the fields.
+    multi table inherited models like the polymorphic billables and jobs need a call per table
+    '''
+    if not rows:
+        return
+    fields = [field for field in model._meta.local_concrete_fields
+              if not isinstance(field, AutoField) or field.attname in rows[0]]
+    defaults = [field.get_default() for field in fields]
+    # the connection itself instead of the thread local proxy, which is slow to access for every value
+    db = connections[DEFAULT_DB_ALIAS]
+    # dates need to be converted by the field for every database, all other values are passed as they are
+    converters = [field.get_db_prep_save if field.get_internal_type() in ('DateField', 'DateTimeField') else None
+                  for field in fields]
+    values = []
+    for row in rows:
+        value_row = []
+        for field, default, converter in zip(fields, defaults, converters):
+            value = row.get(field.attname, default)
+            value_row.append(converter(value, db) if converter is not None else value)
+        values.append(value_row)
+    quote = db.ops.quote_name
+    columns = ', '.join(quote(field.column) for field in fields)
+    placeholders = ', '.join(['%s'] * len(fields))
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(quote(model._meta.db_table), columns, placeholders)
+    with db.cursor() as cursor:
+        cursor.executemany(sql, values)
@@ -0,0 +1,76 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.core.mail import get_connection
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from juntagrico.config import Config
+from juntagrico.dao.outboxemaildao import OutboxEmailDao
+from juntagrico.entity.mailing import OutboxEmail
+
+log = logging.getLogger('juntagrico.mailer')
+
+
+class Mailer:
+    '''
+    stores the emails in the outbox instead of sending them.
+    they are delivered by the send_outbox command using the OUTBOX_MAILER
+    '''
+    def send(msg):
+        if msg.recipients():
+            OutboxEmail.from_email_message(msg).save()
+
+
+def send_outbox_batch(mailer, batch_size, max_attempts, retry_delay):
+    '''
+    deliver one batch of due emails over a single connection.
+    failed emails are retried after retry_delay seconds, doubling the delay after each attempt,
+    and given up after max_attempts.
+    returns the number of sent and failed emails
+    '''
+    sent = failed = 0
+    with transaction.atomic():
+        # skip the emails locked by a concurrent sender where the database supports it
+        skip_locked = connection.features.has_select_for_update_skip_locked
+        batch = list(OutboxEmailDao.due_emails(timezone.now()).select_for_update(skip_locked=skip_locked)[:batch_size])
+        mail_connection = get_connection()
+        try:
+            for outbox_email in batch:
+                email = outbox_email.email_message
+                email.connection = mail_connection
+                try:
+                    mail_connection.open()
+                    mailer.send(email)
+                except Exception as e:
+                    log.warning('Mail to ' + outbox_email.recipients + ' failed: ' + str(e))
+                    outbox_email.attempts += 1
+                    outbox_email.last_error = str(e)
+                    outbox_email.failed = outbox_email.attempts >= max_attempts
+                    outbox_email.next_attempt = timezone.now() + timedelta(
+                        seconds=retry_delay * 2 ** (outbox_email.attempts - 1))
+                    outbox_email.save()
+                    failed += 1
+                else:
+                    outbox_email.delete()
+                    sent += 1
+        finally:
+            mail_connection.close()
+    return sent, failed
+
+
+def send_outbox(batch_size=100, max_attempts=5, retry_delay=300, pause=0):
+    '''
+    deliver all due emails of the outbox in batches, waiting pause seconds between the batches
+    '''
+    mailer = import_string(Config.outbox_mailer())
+    total_sent = total_failed = 0
+    while True:
+        sent, failed = send_outbox_batch(mailer, batch_size, max_attempts, retry_delay)
+        total_sent += sent
+        total_failed += failed
+        if sent + failed < batch_size:
+            return total_sent, total_failed
+        time.sleep(pause)
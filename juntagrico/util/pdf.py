@@ -1,3 +1,4 @@
+from concurrent.futures import ProcessPoolExecutor
 from io import BytesIO
 
 from django.core.files.base import ContentFile
@@ -5,6 +6,7 @@ from django.core.files.storage import default_storage
 from django.http import HttpResponse, HttpResponseServerError
 from django.template.loader import get_template
 from xhtml2pdf import pisa
+from xhtml2pdf.pdf import pisaPDF
 
 
 def render_to_pdf_http(template_name, renderdict, filename):
@@ -36,13 +38,53 @@ def return_pdf_http(filename):
         return HttpResponseServerError()
 
 
-def render_to_pdf_storage(template_name, renderdict, filename):
+def html_to_pdf(rendered_html):
     '''
-    Take a string of rendered html and pack it into a pdfand save it
+    convert a string of rendered html into the content of a pdf.
+    does not access the database, so it can run in a separate process
+    '''
+    pdf = BytesIO()
+    pisa.CreatePDF(BytesIO(str(rendered_html).encode('utf-8')), dest=pdf)
+    return pdf.getvalue()
+
+
+def merge_pdfs(pdfs):
+    '''
+    concatenate the pages of the given pdf contents
     '''
+    if len(pdfs) == 1:
+        return pdfs[0]
+    merged = pisaPDF()
+    for pdf in pdfs:
+        merged.addFromFile(BytesIO(pdf))
+    return merged.join()
+
+
+def read_pdf_storage(filename):
+    with default_storage.open(filename) as pdf_file:
+        return pdf_file.read()
+
+
+def save_pdf_storage(content, filename):
     if default_storage.exists(filename):
         default_storage.delete(filename)
+    default_storage.save(filename, ContentFile(content))
+
+
+def render_to_pdf_storage(template_name, renderdict, filename):
+    '''
+    Take a string of rendered html and pack it into a pdfand save it
+    '''
     rendered_html = get_template(template_name).render(renderdict)
-    pdf = BytesIO()
-    pisa.CreatePDF(BytesIO(str(rendered_html).encode('utf-8')), dest=pdf)
-    default_storage.save(filename, ContentFile(pdf.getvalue()))
+    save_pdf_storage(html_to_pdf(rendered_html), filename)
+
+
+def htmls_to_pdfs(htmls, processes=None):
+    '''
+    convert a list of rendered html into pdf contents.
+    they are converted in a pool of processes (by default one per cpu), or sequentially if processes is 1
+    '''
+    if processes == 1 or len(htmls) <= 1:
+        return [html_to_pdf(html) for html in htmls]
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(html_to_pdf, htmls))
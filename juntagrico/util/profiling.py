@@ -0,0 +1,124 @@
+import json
+import logging
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+from django.template.base import Template
+
+from juntagrico.config import Config
+
+log = logging.getLogger('juntagrico.profiling')
+
+_local = threading.local()
+_lock = threading.Lock()
+_active_profiles = 0
+_original_render = Template.render
+
+
+class RequestProfile:
+    '''
+    context manager recording the queries, the sql time and the template render time of the current thread.
+    the template time contains the time of the queries issued while rendering
+    '''
+
+    def __init__(self):
+        self.queries = []
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.total_time = 0.0
+        self._stack = None
+        self._start = None
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        self._stack.enter_context(_instrumented_templates())
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self._execute))
+        _local.profile = self
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.total_time = time.perf_counter() - self._start
+        _local.profile = None
+        self._stack.close()
+
+    @property
+    def query_count(self):
+        return len(self.queries)
+
+    def _execute(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - start
+            self.queries.append(sql)
+
+    def as_dict(self):
+        return {
+            'queries': self.query_count,
+            'sql_time': round(self.sql_time, 6),
+            'template_time': round(self.template_time, 6),
+            'total_time': round(self.total_time, 6),
+        }
+
+
+def _profiled_render(self, context):
+    profile = getattr(_local, 'profile', None)
+    if profile is None or getattr(_local, 'rendering', False):
+        return _original_render(self, context)
+    _local.rendering = True
+    start = time.perf_counter()
+    try:
+        return _original_render(self, context)
+    finally:
+        profile.template_time += time.perf_counter() - start
+        _local.rendering = False
+
+
+@contextmanager
+def _instrumented_templates():
+    '''
+    wrap the template rendering while any request is profiled, to measure the render time of the outermost template.
+    the original render method is restored when the last profile ends
+    '''
+    global _active_profiles, _original_render
+    with _lock:
+        if _active_profiles == 0:
+            _original_render = Template.render
+            Template.render = _profiled_render
+        _active_profiles += 1
+    try:
+        yield
+    finally:
+        with _lock:
+            _active_profiles -= 1
+            if _active_profiles == 0:
+                Template.render = _original_render
+
+
+class QueryProfileMiddleware:
+    '''
+    records the number of queries, the sql time and the template render time of each view.
+    the profiles are logged to the juntagrico.profiling logger and appended as json lines to QUERY_PROFILE_FILE if it is set
+    '''
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with RequestProfile() as profile:
+            response = self.get_response(request)
+        match = request.resolver_match
+        record = dict(profile.as_dict(), view=match.view_name if match else None, path=request.path,
+                      method=request.method, status=response.status_code)
+        log.info('%(method)s %(path)s (%(view)s): %(queries)d queries in %(sql_time).3fs, '
+                 'templates %(template_time).3fs, total %(total_time).3fs', record)
+        filename = Config.query_profile_file()
+        if filename:
+            with open(filename, 'a') as profile_file:
+                profile_file.write(json.dumps(record) + '\n')
+        return response
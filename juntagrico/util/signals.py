@@ -7,7 +7,8 @@ from juntagrico.entity import JuntagricoBaseModel, JuntagricoBasePoly
 
 
 def set_old_state(sender, instance, **kwds):
-    instance._old = instance.__dict__.copy()
+    values = instance.__dict__
+    instance._old = {field: values[field] for field in sender._old_fields if field in values}
 
 
 def register_entities_for_post_init_and_save():
@@ -16,5 +17,9 @@ def register_entities_for_post_init_and_save():
     classes = list(dict.fromkeys(classes))
     for name, obj in classes:
         if issubclass(obj, (JuntagricoBaseModel, JuntagricoBasePoly)) and obj != JuntagricoBaseModel and obj != JuntagricoBasePoly:
-            signals.post_init.connect(set_old_state, sender=obj)
-            signals.post_save.connect(set_old_state, sender=obj)
+            # only remember the fields of the model the lifecycle handlers compare
+            attnames = {field.attname for field in obj._meta.concrete_fields}
+            obj._old_fields = tuple(field for field in obj.old_state_fields if field in attnames)
+            if obj._old_fields:
+                signals.post_init.connect(set_old_state, sender=obj)
+                signals.post_save.connect(set_old_state, sender=obj)
@@ -1,21 +1,34 @@
-from juntagrico.dao.memberdao import MemberDao
+from django.db.models import Prefetch
+
+from juntagrico.dao.subscriptiondao import SubscriptionDao
+from juntagrico.entity.extrasubs import ExtraSubscription
+from juntagrico.entity.subtypes import SubscriptionType
+
+
+def active_extra_subscriptions_prefetch():
+    '''
+    prefetch of the active extra subscriptions as used by Subscription.active_extra_subscriptions
+    '''
+    return Prefetch('extra_subscription_set', queryset=ExtraSubscription.objects.filter(active=True).select_related('type'),
+                    to_attr='prefetched_active_extra_subscriptions')
 
 
 def subscriptions_with_assignments(subscriptions):
+    '''
+    the subscriptions with their assignment sums and active recipients for the subscription lists,
+    loaded with the type totals, members and extra subscriptions in a fixed number of queries
+    '''
+    subscriptions = SubscriptionDao.annotate_assignment_counts(SubscriptionDao.annotate_type_totals(subscriptions))\
+        .select_related('primary_member__user', 'depot')\
+        .prefetch_related(Prefetch('types', queryset=SubscriptionType.objects.select_related('size__product'), to_attr='prefetched_types'),
+                          Prefetch('members', to_attr='prefetched_members'),
+                          active_extra_subscriptions_prefetch())
     subscriptions_list = []
     for subscription in subscriptions:
-        assignments = 0
-        core_assignments = 0
-        members = MemberDao.members_with_assignments_count_in_subscription(
-            subscription)
-        for member in members:
-            assignments += member.assignment_count \
-                if member.assignment_count is not None else 0
-            core_assignments += member.core_assignment_count \
-                if member.core_assignment_count is not None else 0
         subscriptions_list.append({
             'subscription': subscription,
-            'assignments': assignments,
-            'core_assignments': core_assignments
+            'assignments': subscription.assignment_count,
+            'core_assignments': subscription.core_assignment_count,
+            'recipients': [member for member in subscription.prefetched_members if not member.inactive],
         })
     return subscriptions_list
@@ -0,0 +1,191 @@
+import datetime
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from juntagrico.entity.billing import Billable
+from juntagrico.entity.depot import Depot
+from juntagrico.entity.jobs import ActivityArea, Assignment, Job, JobType, RecuringJob
+from juntagrico.entity.member import Member
+from juntagrico.entity.share import Share
+from juntagrico.entity.subs import Subscription
+from juntagrico.entity.subtypes import SubscriptionProduct, SubscriptionSize, SubscriptionType, TFSST, TSST
+from juntagrico.util.menu import invalidate_menu_cache
+from juntagrico.util.models import insert_rows
+from juntagrico.util.users import make_username
+
+FIRST_NAMES = ['Anna', 'Beat', 'Carla', 'Dario', 'Elena', 'Fabian', 'Gina', 'Hans', 'Ines', 'Jonas', 'Karin', 'Luca',
+               'Maria', 'Nico', 'Olivia', 'Peter', 'Rahel', 'Simon', 'Tanja', 'Urs', 'Vera', 'Walter', 'Yara', 'Zoe']
+LAST_NAMES = ['Ammann', 'Baumann', 'Brunner', 'Fischer', 'Frei', 'Gerber', 'Graf', 'Huber', 'Keller', 'Koch', 'Meier',
+              'Moser', 'Müller', 'Schmid', 'Schneider', 'Steiner', 'Weber', 'Widmer', 'Wyss', 'Zimmermann']
+STREETS = ['Bahnhofstrasse', 'Dorfstrasse', 'Hauptstrasse', 'Kirchweg', 'Lindenweg', 'Rosenweg', 'Schulstrasse',
+           'Seestrasse']
+LOCATIONS = [('8001', 'Zürich'), ('3011', 'Bern'), ('4051', 'Basel'), ('6003', 'Luzern'), ('9000', 'St. Gallen'),
+             ('8400', 'Winterthur')]
+AREAS = [('Ernten', True), ('Jäten', False), ('Abpacken', True), ('Verteilen', False), ('Administration', False)]
+
+
+def _ids(model, count):
+    '''
+    reserve count primary keys following the highest existing one.
+    the keys are assigned explicitly, because bulk_create does not return them on every database
+    '''
+    start = (model._base_manager.aggregate(max_id=Max('pk'))['max_id'] or 0) + 1
+    return range(start, start + count)
+
+
+def _ctype_id(model):
+    return ContentType.objects.get_for_model(model, for_concrete_model=False).id
+
+
+def generate_dataset(members=1000, depots=20, jobs=500, assignments=10000, seed=0, password='12345'):
+    '''
+    create a synthetic dataset offline, seeded and with bulk inserts, to benchmark and profile at realistic scale.
+    the data is added to the existing one, no signals or lifecycle handlers are run.
+    returns the number of created rows per model
+    '''
+    rnd = random.Random(seed)
+    now = timezone.now()
+    today = now.date()
+    start_date = today - datetime.timedelta(days=180)
+
+    with transaction.atomic():
+        product, created = SubscriptionProduct.objects.get_or_create(name='Gemüse')
+        sizes = [SubscriptionSize.objects.get_or_create(
+            name=name, product=product, defaults={'long_name': name, 'units': units, 'depot_list': True})[0]
+            for name, units in [('Klein', 1), ('Gross', 2)]]
+        types = [SubscriptionType.objects.get_or_create(
+            name=size.name + ' Abo', size=size,
+            defaults={'long_name': size.name, 'shares': size.units, 'required_assignments': 4 * size.units,
+                      'required_core_assignments': size.units, 'price': 600 * size.units})[0] for size in sizes]
+
+        # members and their users
+        password_hash = make_password(password)
+        users = []
+        member_rows = []
+        for user_id, member_id in zip(_ids(User, members), _ids(Member, members)):
+            first_name = rnd.choice(FIRST_NAMES)
+            last_name = rnd.choice(LAST_NAMES)
+            email = 'member{}@testdata.juntagrico'.format(member_id)
+            zipcode, location = rnd.choice(LOCATIONS)
+            users.append({'id': user_id, 'username': make_username(first_name, last_name, email),
+                          'password': password_hash, 'date_joined': now})
+            member_rows.append({'id': member_id, 'user_id': user_id, 'first_name': first_name, 'last_name': last_name,
+                                'email': email, 'addr_street': '{} {}'.format(rnd.choice(STREETS), rnd.randint(1, 99)),
+                                'addr_zipcode': zipcode, 'addr_location': location,
+                                'phone': '079 {:03} {:02} {:02}'.format(rnd.randint(0, 999), rnd.randint(0, 99),
+                                                                        rnd.randint(0, 99)),
+                                'confirmed': True, 'reachable_by_email': rnd.random() < 0.5})
+
+        depot_rows = []
+        for depot_id in _ids(Depot, depots):
+            zipcode, location = rnd.choice(LOCATIONS)
+            depot_rows.append({'id': depot_id, 'code': 'D{}'.format(depot_id), 'name': 'Depot {}'.format(depot_id),
+                               'contact_id': rnd.choice(member_rows)['id'], 'weekday': rnd.randint(1, 7),
+                               'capacity': rnd.randint(10, 100), 'addr_street': rnd.choice(STREETS),
+                               'addr_zipcode': zipcode, 'addr_location': location})
+
+        # subscriptions of one to three members, most active, some waiting, canceled or changing their size
+        subscription_ctype = _ctype_id(Subscription)
+        share_ctype = _ctype_id(Share)
+        billable_ids = iter(_ids(Billable, members * 6))
+        subscription_rows = []
+        share_rows = []
+        tsst_rows = []
+        tfsst_rows = []
+        index = 0
+        while index < len(member_rows) and depot_rows:
+            recipients = member_rows[index:index + rnd.randint(1, 3)]
+            index += len(recipients)
+            if rnd.random() < 0.1:
+                # members without subscription keep one share
+                for member in recipients:
+                    share_rows.append({'id': next(billable_ids), 'polymorphic_ctype_id': share_ctype,
+                                       'member_id': member['id'], 'paid_date': start_date, 'issue_date': start_date})
+                continue
+            state = rnd.random()
+            waiting = state < 0.05
+            canceled = 0.05 <= state < 0.1
+            subscription_id = next(billable_ids)
+            subscription_rows.append({'id': subscription_id, 'polymorphic_ctype_id': subscription_ctype,
+                                      'depot_id': rnd.choice(depot_rows)['id'], 'primary_member_id': recipients[0]['id'],
+                                      'active': not waiting, 'activation_date': None if waiting else start_date,
+                                      'creation_date': start_date, 'start_date': start_date, 'canceled': canceled,
+                                      'cancelation_date': today if canceled else None})
+            for member in recipients:
+                member['future_subscription_id' if waiting else 'subscription_id'] = subscription_id
+            sub_types = [rnd.choice(types) for i in range(rnd.randint(1, 2))]
+            future_types = [rnd.choice(types)] if 0.1 <= state < 0.15 else sub_types
+            tsst_rows += [{'subscription_id': subscription_id, 'type_id': sub_type.id} for sub_type in sub_types]
+            tfsst_rows += [{'subscription_id': subscription_id, 'type_id': sub_type.id} for sub_type in future_types]
+            for i in range(sum(sub_type.shares for sub_type in sub_types)):
+                share_rows.append({'id': next(billable_ids), 'polymorphic_ctype_id': share_ctype,
+                                   'member_id': recipients[i % len(recipients)]['id'], 'paid_date': start_date,
+                                   'issue_date': start_date})
+        for row in subscription_rows + share_rows:
+            row['billable_ptr_id'] = row['id']
+
+        # areas, job types and jobs spread over half a year before and after today
+        areas = [ActivityArea.objects.get_or_create(name=name, defaults={'core': core,
+                                                                         'coordinator_id': member_rows[0]['id']})[0]
+                 for name, core in AREAS]
+        area_member_rows = []
+        for member in member_rows:
+            area_member_rows += [{'activityarea_id': area.id, 'member_id': member['id']}
+                                 for area in rnd.sample(areas, rnd.randint(0, 2))]
+        job_types = [JobType.objects.get_or_create(name='{} {}'.format(area.name, i), activityarea=area,
+                                                   defaults={'duration': rnd.randint(1, 4)})[0]
+                     for area in areas for i in range(2)]
+        job_ctype = _ctype_id(RecuringJob)
+        job_rows = []
+        for job_id in _ids(Job, jobs):
+            time = now + datetime.timedelta(days=rnd.randint(-180, 180), hours=rnd.randint(-6, 6))
+            job_type = rnd.choice(job_types)
+            job_rows.append({'id': job_id, 'job_ptr_id': job_id, 'polymorphic_ctype_id': job_ctype,
+                             'type_id': job_type.id, 'core': job_type.activityarea.core, 'slots': rnd.randint(2, 10),
+                             'time': time, 'reminder_sent': time < now})
+        assignment_rows = []
+        if job_rows:
+            for i in range(assignments):
+                job = rnd.choice(job_rows)
+                assignment_rows.append({'job_id': job['id'], 'member_id': rnd.choice(member_rows)['id'],
+                                        'core_cache': job['core'], 'amount': 1})
+                job['assigned'] = job.get('assigned', 0) + 1
+        for job in job_rows:
+            job['occupied_slots'] = job.get('assigned', 0)
+            job['slots'] = max(job['slots'], job['occupied_slots'])
+
+        insert_rows(User, users)
+        insert_rows(Member, member_rows)
+        insert_rows(Depot, depot_rows)
+        insert_rows(Billable, subscription_rows + share_rows)
+        insert_rows(Subscription, subscription_rows)
+        insert_rows(Share, share_rows)
+        insert_rows(TSST, tsst_rows)
+        insert_rows(TFSST, tfsst_rows)
+        insert_rows(ActivityArea.members.through, area_member_rows)
+        insert_rows(Job, job_rows)
+        insert_rows(RecuringJob, job_rows)
+        insert_rows(Assignment, assignment_rows)
+
+        # the explicitly assigned keys do not advance the sequences of the databases using them
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [User, Member, Depot, Billable, Job]):
+                cursor.execute(sql)
+    # the inserts send no signals
+    invalidate_menu_cache()
+
+    return {
+        'members': len(member_rows),
+        'depots': len(depot_rows),
+        'subscriptions': len(subscription_rows),
+        'shares': len(share_rows),
+        'jobs': len(job_rows),
+        'assignments': len(assignment_rows),
+    }
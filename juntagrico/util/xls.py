@@ -1,9 +1,33 @@
-from io import BytesIO
+from tempfile import TemporaryFile
 
+from django.core.exceptions import FieldDoesNotExist
 from django.db import models
-from django.http import HttpResponse
+from django.db.models.query import QuerySet
+from django.http import FileResponse
 from xlsxwriter import Workbook
 
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+def streaming_workbook():
+    """
+    Create a workbook in constant memory mode, which flushes each row once the next one is written.
+    Rows must therefore be written in order. The workbook is stored in a temporary file.
+    Returns the temporary file and the workbook.
+    """
+    output = TemporaryFile()
+    return output, Workbook(output, {'constant_memory': True})
+
+
+def workbook_response(output, download_name):
+    """
+    Stream a closed workbook created with streaming_workbook as a download.
+    The temporary file is closed by the response.
+    """
+    output.seek(0)
+    return FileResponse(output, as_attachment=True, filename='%s.xlsx' % download_name,
+                        content_type=XLSX_CONTENT_TYPE)
+
 
 def generate_excel(fields, data, download_name=None):
     """
@@ -23,18 +47,11 @@ def generate_excel(fields, data, download_name=None):
         data_name = 'Report'
     download_name = download_name or data_name
 
-    output = BytesIO()
-    workbook = Workbook(output)
+    output, workbook = streaming_workbook()
     writer = ExcelWriter(fields, workbook)
     writer.write_data(data)
     workbook.close()
-    t = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    response = HttpResponse(content_type=t)
-    disposition = 'attachment; filename=%s.xlsx' % download_name
-    response['Content-Disposition'] = disposition
-    response.write(output.getvalue())
-
-    return response
+    return workbook_response(output, download_name)
 
 
 class ExcelWriter(object):
@@ -70,10 +87,24 @@ class ExcelWriter(object):
             list_data = data
             self.model = None
 
+        if isinstance(list_data, QuerySet):
+            # follow the relations of the fields in the same query and do not cache the rows
+            related = self.get_related_paths(list_data.model)
+            if related:
+                list_data = list_data.select_related(*related)
+            list_data = list_data.iterator()
+
         # create a worksheet
         self.worksheet = self.workbook.add_worksheet()
         self.write_header()
 
+        # define numeric formats. in constant memory mode rows are flushed before the column formats are set,
+        # so the formats are also applied to each cell
+        self.formats = {
+            'date': self.workbook.add_format({'num_format': 'dd/mm/yy'}),
+            'float': self.workbook.add_format({'num_format': '#0.00'}),
+        }
+
         # write data rows
         row = 1
         for item in list_data:
@@ -84,7 +115,7 @@ class ExcelWriter(object):
                 else:
                     fieldname, label = fielddef
                 value = self.get_value(item, fieldname)
-                self.worksheet.write(row, col, value)
+                self.worksheet.write(row, col, value, self.formats.get(type(value).__name__))
 
                 # record field-type from value
                 if (not self.fieldtypes[col]) and value:
@@ -110,18 +141,8 @@ class ExcelWriter(object):
     def format_columns(self):
         min_width = 8
 
-        # define numeric formats
-        curr_format = self.workbook.add_format({'num_format': '#0.00'})
-        date_format = self.workbook.add_format({'num_format': 'dd/mm/yy'})
-
         for i, label in enumerate(self.get_header_labels()):
-            fieldtype = self.fieldtypes[i]
-
-            fmt = None
-            if fieldtype == 'date':
-                fmt = date_format
-            if fieldtype == 'float':
-                fmt = curr_format
+            fmt = self.formats.get(self.fieldtypes[i])
             width = max(min_width, len(label) * 1.2)
             self.worksheet.set_column(i, i, width, fmt)
 
@@ -153,6 +174,26 @@ class ExcelWriter(object):
             count += 1
         return fieldvalue
 
+    def get_related_paths(self, model):
+        paths = []
+        for fielddef in self.fields:
+            fieldname = fielddef if isinstance(fielddef, str) else fielddef[0]
+            parts = fieldname.split('.')
+            current = model
+            path = []
+            for part in parts[:-1]:
+                try:
+                    dbfield = current._meta.get_field(part)
+                except FieldDoesNotExist:
+                    break
+                if not (dbfield.many_to_one or dbfield.one_to_one):
+                    break
+                path.append(part)
+                current = dbfield.related_model
+            if path:
+                paths.append('__'.join(path))
+        return paths
+
     def get_label_from_model(self, model, field_expression):
         parts = field_expression.split('.')
         count = 1
@@ -1,23 +1,21 @@
+
 from django.contrib import auth
 from django.contrib.auth.decorators import login_required
-from django.db.models import Count
-from django.http import HttpResponse
+from django.core.exceptions import ValidationError
+from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse
 from django.shortcuts import render, get_object_or_404, redirect
+from django.template.loader import get_template
+from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
-from juntagrico.config import Config
 from juntagrico.dao.activityareadao import ActivityAreaDao
 from juntagrico.dao.assignmentdao import AssignmentDao
 from juntagrico.dao.deliverydao import DeliveryDao
-from juntagrico.dao.depotdao import DepotDao
-from juntagrico.dao.extrasubscriptioncategorydao import ExtraSubscriptionCategoryDao
 from juntagrico.dao.jobdao import JobDao
-from juntagrico.dao.jobextradao import JobExtraDao
-from juntagrico.dao.jobtypedao import JobTypeDao
 from juntagrico.dao.memberdao import MemberDao
 from juntagrico.entity.depot import Depot
-from juntagrico.entity.jobs import Job, Assignment, ActivityArea
+from juntagrico.entity.jobs import Job, ActivityArea
 from juntagrico.entity.member import Member
 from juntagrico.forms import MemberProfileForm, PasswordForm
 from juntagrico.mailer import adminnotification
@@ -26,10 +24,14 @@ from juntagrico.mailer import formemails
 from juntagrico.mailer import membernotification
 from juntagrico.util import addons
 from juntagrico.util.admin import get_job_admin_url
-from juntagrico.util.management import password_generator, cancel_share
+from juntagrico.util.jobs import job_days_matching, job_table_row
+from juntagrico.util.management import password_generator, cancel_share, sign_up_for_job
+from juntagrico.util.menu import get_menu_context
 from juntagrico.util.messages import home_messages, job_messages
 from juntagrico.util.temporal import next_membership_end_date
 
+ALL_JOBS_PAGE_SIZE = 100
+
 
 def get_page_dict(request):
     return {
@@ -38,55 +40,14 @@ def get_page_dict(request):
 
 
 def get_menu_dict(request):
-    member = request.user.member
-    next_jobs = JobDao.upcomming_jobs_for_member(member)
-
-    required_assignments = 0
-    if member.subscription is not None:
-        partner_assignments = []
-        for subscription_member in member.subscription.recipients_all:
-            if subscription_member == member:
-                continue
-            partner_assignments.extend(
-                AssignmentDao.assignments_for_member_current_business_year(subscription_member))
-
-        userassignments = AssignmentDao.assignments_for_member_current_business_year(
-            member)
-        required_assignments = member.subscription.required_assignments
-    else:
-        partner_assignments = []
-        userassignments = []
-
-    userassignments_total = int(sum(a.amount for a in userassignments))
-    userassignemnts_core = int(
-        sum(a.amount for a in userassignments if a.is_core()))
-    partner_assignments_total = int(sum(a.amount for a in partner_assignments))
-    partner_assignments_core = int(
-        sum(a.amount for a in partner_assignments if a.is_core()))
-    assignmentsrange = list(range(
-        0, max(required_assignments, userassignments_total + partner_assignments_total)))
-
-    depot_admin = DepotDao.depots_for_contact(request.user.member)
-    area_admin = ActivityAreaDao.areas_by_coordinator(request.user.member)
     menu_dict = get_page_dict(request)
+    menu_dict.update(get_menu_context(request.user.member))
     menu_dict.update({
         'user': request.user,
-        'assignmentsrange': assignmentsrange,
-        'userassignments_bound': userassignments_total,
-        'userassignemnts_core_bound': userassignemnts_core,
-        'partner_assignments_bound': userassignments_total + partner_assignments_total,
-        'partner_assignments_core_bound': userassignments_total + partner_assignments_core,
-        'next_jobs': next_jobs,
         'can_filter_members': request.user.has_perm('juntagrico.can_filter_members'),
         'can_filter_subscriptions': request.user.has_perm('juntagrico.can_filter_subscriptions'),
         'can_send_mails': request.user.has_perm('juntagrico.can_send_mails'),
         'operation_group': request.user.has_perm('juntagrico.is_operations_group'),
-        'has_extra_subscriptions': ExtraSubscriptionCategoryDao.all_categories_ordered().count() > 0,
-        'depot_admin': depot_admin,
-        'area_admin': area_admin,
-        'show_core': ActivityAreaDao.all_core_areas().count() > 0,
-        'show_extras': JobExtraDao.all_job_extras().count() > 0,
-        'show_deliveries': len(DeliveryDao.deliveries_by_subscription(request.user.member.subscription)) > 0,
         'admin_menus': addons.config.get_admin_menus(),
         'admin_subscription_menus': addons.config.get_admin_subscription_menu(),
         'user_menus': addons.config.get_user_menus(),
@@ -102,13 +63,14 @@ def home(request):
     Overview on juntagrico
     '''
 
-    next_jobs = set(JobDao.get_current_jobs()[:7])
-    pinned_jobs = set(JobDao.get_pinned_jobs())
-    next_promotedjobs = set(JobDao.get_promoted_jobs())
+    next_jobs = set(JobDao.get_current_jobs()[:7].values_list('id', flat=True))
+    pinned_jobs = set(JobDao.get_pinned_jobs().values_list('id', flat=True))
+    next_promotedjobs = set(JobDao.get_promoted_jobs().values_list('id', flat=True))
+    jobs = JobDao.jobs_by_ids(next_jobs.union(pinned_jobs).union(next_promotedjobs)).order_by('time')
     renderdict = get_menu_dict(request)
     renderdict['messages'].extend(home_messages(request))
     renderdict.update({
-        'jobs': sorted(next_jobs.union(pinned_jobs).union(next_promotedjobs), key=lambda job: job.time),
+        'jobs': JobDao.jobs_for_list(jobs),
         'areas': ActivityAreaDao.all_visible_areas_ordered(),
     })
 
@@ -123,44 +85,33 @@ def job(request, job_id):
     member = request.user.member
     job = get_object_or_404(Job, id=int(job_id))
 
+    signup_error = None
     if request.method == 'POST':
-        num = request.POST.get('jobs')
-        # adding participants
-        amount = 1
-        if Config.assignment_unit() == 'ENTITY':
-            amount = job.multiplier
-        elif Config.assignment_unit() == 'HOURS':
-            amount = job.multiplier * job.type.duration
-        add = int(num)
-        for i in range(add):
-            assignment = Assignment.objects.create(
-                member=member, job=job, amount=amount)
-        for extra in job.type.job_extras_set.all():
-            if request.POST.get('extra' + str(extra.extra_type.id)) == str(extra.extra_type.id):
-                assignment.job_extras.add(extra)
-        assignment.save()
-
-        membernotification.job_signup(member.email, job)
-        # redirect to same page such that refresh in the browser or back
-        # button does not trigger a resubmission of the form
-        return redirect('job', job_id=job_id)
-
-    all_participants = MemberDao.members_by_job(job)
-    number_of_participants = len(all_participants)
-    unique_participants = all_participants.annotate(
-        assignment_for_job=Count('id')).distinct()
+        extra_type_ids = [extra_type_id for key, extra_type_id in request.POST.items() if key == 'extra' + extra_type_id]
+        try:
+            sign_up_for_job(job, member, int(request.POST.get('jobs')), extra_type_ids)
+        except ValidationError as error:
+            signup_error = ' '.join(error.messages)
+        else:
+            membernotification.job_signup(member.email, job)
+            # redirect to same page such that refresh in the browser or back
+            # button does not trigger a resubmission of the form
+            return redirect('job', job_id=job_id)
+
+    job = JobDao.job_detail(job)
+    number_of_participants = job.occupied_places()
 
     participants_summary = []
     emails = []
-    for member in unique_participants:
+    for member, assignments in job.assignments_by_member():
         name = '{} {}'.format(member.first_name, member.last_name)
-        if member.assignment_for_job == 2:
+        if len(assignments) == 2:
             name += _(' (mit einer weiteren Person)')
-        elif member.assignment_for_job > 2:
-            name += _(' (mit {} weiteren Personen)').format(member.assignment_for_job - 1)
+        elif len(assignments) > 2:
+            name += _(' (mit {} weiteren Personen)').format(len(assignments) - 1)
         contact_url = '/my/contact/member/{}/{}/'.format(member.id, job_id)
         extras = []
-        for assignment in AssignmentDao.assignments_for_job_and_member(job.id, member):
+        for assignment in assignments:
             for extra in assignment.job_extras.all():
                 extras.append(extra.extra_type.display_full)
         reachable = member.reachable_by_email is True or request.user.is_staff or job.type.activityarea.coordinator == member
@@ -178,7 +129,9 @@ def job(request, job_id):
         job_fully_booked or job_is_in_past or job_is_running or job_canceled)
 
     renderdict = get_menu_dict(request)
-    renderdict['messages'].extend(job_messages(request, job))
+    if signup_error is not None:
+        renderdict['messages'].append(get_template('messages/job_signup_failed.html').render({'error': signup_error}))
+    renderdict['messages'].extend(job_messages(request, job, job.participants))
     renderdict.update({
         'admin': request.user.is_staff or job.type.activityarea.coordinator == member,
         'emails': '\n'.join(emails),
@@ -188,7 +141,7 @@ def job(request, job_id):
         'slotrange': slotrange,
         'allowed_additional_participants': allowed_additional_participants,
         'can_subscribe': can_subscribe,
-        'edit_url': get_job_admin_url(request, job)
+        'edit_url': get_job_admin_url(request, job.job)
     })
     return render(request, 'job.html', renderdict)
 
@@ -254,13 +207,7 @@ def show_area(request, area_id):
     Details for an area
     '''
     area = get_object_or_404(ActivityArea, id=int(area_id))
-    job_types = JobTypeDao.types_by_area(area_id)
-    otjobs = JobDao.get_current_one_time_jobs().filter(activityarea=area_id)
-    rjobs = JobDao.get_current_recuring_jobs().filter(type__in=job_types)
-    jobs = list(rjobs)
-    if len(otjobs) > 0:
-        jobs.extend(list(otjobs))
-        jobs.sort(key=lambda job: job.time)
+    jobs = JobDao.jobs_for_list(JobDao.get_current_jobs_by_area(area))
     area_checked = request.user.member in area.members.all()
     renderdict = get_menu_dict(request)
     renderdict.update({
@@ -298,7 +245,7 @@ def jobs(request):
     '''
     renderdict = get_menu_dict(request)
 
-    jobs = JobDao.get_jobs_for_current_day()
+    jobs = JobDao.jobs_for_list(JobDao.get_jobs_for_current_day())
     renderdict.update({
         'jobs': jobs,
         'show_all': True,
@@ -314,15 +261,62 @@ def all_jobs(request):
     All jobs to be sorted etc.
     '''
     renderdict = get_menu_dict(request)
-    jobs = JobDao.jobs_ordered_by_time()
     renderdict.update({
-        'jobs': jobs,
+        'jobs': [],
+        'jobs_data_url': reverse('jobs-all-data'),
+        'areas': ActivityAreaDao.all_visible_areas_ordered(),
         'menu': {'jobs': 'active'},
     })
 
     return render(request, 'jobs.html', renderdict)
 
 
+@login_required
+def all_jobs_data(request):
+    '''
+    All jobs for the server side processing of the job table
+    '''
+    try:
+        area = int(request.GET['area']) if request.GET.get('area') else None
+        start = max(int(request.GET.get('start', 0)), 0)
+        length = int(request.GET.get('length', ALL_JOBS_PAGE_SIZE))
+        draw = int(request.GET.get('draw', 0))
+    except ValueError:
+        return HttpResponseBadRequest(_('Ungültige Parameter'))
+    jobs = JobDao.jobs_ordered_by_time()
+    if area is not None:
+        jobs = jobs & JobDao.jobs_by_area(area)
+    records_total = jobs.count()
+
+    search = request.GET.get('search[value]')
+    if search:
+        jobs = jobs & (JobDao.jobs_by_text(search) | JobDao.jobs_on_days(job_days_matching(jobs, search)))
+    index = 0
+    while 'columns[{}][data]'.format(index) in request.GET:
+        column = request.GET.get('columns[{}][data]'.format(index))
+        column_search = request.GET.get('columns[{}][search][value]'.format(index))
+        if column_search and column == 'job':
+            jobs = jobs & JobDao.jobs_by_text(column_search)
+        elif column_search and column == 'date':
+            jobs = jobs & JobDao.jobs_on_days(job_days_matching(jobs, column_search))
+        index += 1
+    records_filtered = jobs.count()
+
+    order_column = request.GET.get('columns[{}][data]'.format(request.GET.get('order[0][column]')))
+    if order_column == 'date' and request.GET.get('order[0][dir]') == 'desc':
+        jobs = jobs.order_by('-time')
+    length = ALL_JOBS_PAGE_SIZE if length < 1 else min(length, ALL_JOBS_PAGE_SIZE)
+    page_ids = list(jobs[start:start + length].values_list('id', flat=True))
+    page = JobDao.jobs_by_ids(page_ids).order_by(*jobs.query.order_by)
+
+    return JsonResponse({
+        'draw': draw,
+        'recordsTotal': records_total,
+        'recordsFiltered': records_filtered,
+        'data': [job_table_row(job) for job in JobDao.jobs_for_list(page)],
+    })
+
+
 @login_required
 def deliveries(request):
     '''
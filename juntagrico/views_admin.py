@@ -1,5 +1,4 @@
 import re
-from io import BytesIO
 
 from django.contrib.auth.decorators import permission_required
 from django.http import Http404, HttpResponse
@@ -7,9 +6,9 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.template import Template, Context
 from django.utils import timezone
 from django.utils.translation import gettext as _
-from xlsxwriter import Workbook
 
 from juntagrico.config import Config
+from juntagrico.dao.activityareadao import ActivityAreaDao
 from juntagrico.dao.extrasubscriptiondao import ExtraSubscriptionDao
 from juntagrico.dao.extrasubscriptiontypedao import ExtraSubscriptionTypeDao
 from juntagrico.dao.mailtemplatedao import MailTemplateDao
@@ -17,6 +16,7 @@ from juntagrico.dao.memberdao import MemberDao
 from juntagrico.dao.sharedao import ShareDao
 from juntagrico.dao.subscriptiondao import SubscriptionDao
 from juntagrico.dao.subscriptionsizedao import SubscriptionSizeDao
+from juntagrico.dao.subscriptiontypedao import SubscriptionTypeDao
 from juntagrico.entity.depot import Depot
 from juntagrico.entity.jobs import ActivityArea
 from juntagrico.entity.member import Member
@@ -26,9 +26,9 @@ from juntagrico.mailer import formemails
 from juntagrico.util import return_to_previous_location
 from juntagrico.util.management_list import get_changedate
 from juntagrico.util.pdf import return_pdf_http
-from juntagrico.util.subs import subscriptions_with_assignments
+from juntagrico.util.subs import active_extra_subscriptions_prefetch, subscriptions_with_assignments
 from juntagrico.util.views_admin import subscription_management_list
-from juntagrico.util.xls import generate_excel
+from juntagrico.util.xls import generate_excel, streaming_workbook, workbook_response
 from juntagrico.views import get_menu_dict
 
 
@@ -72,13 +72,12 @@ def send_email_intern(request):
     append_attachements(request, files)
 
     if len(emails) > 0:
-        formemails.internal(
+        sent = formemails.internal(
             request.POST.get('subject'),
             request.POST.get('message'),
             request.POST.get('textMessage'),
             emails, files, sender=sender
         )
-        sent = len(emails)
     return redirect('mail-result', numsent=sent)
 
 
@@ -206,11 +205,9 @@ def amount_overview(request):
 def future(request):
     renderdict = get_menu_dict(request)
 
-    subscriptionsizes = []
     subscription_lines = dict({})
     extra_lines = dict({})
-    for subscription_size in SubscriptionSizeDao.all_sizes_ordered():
-        subscriptionsizes.append(subscription_size.id)
+    for subscription_size in SubscriptionSizeDao.all_sizes_ordered().select_related('product'):
         subscription_lines[subscription_size.id] = {
             'name': subscription_size.product.name + '-' + subscription_size.name,
             'future': 0,
@@ -222,24 +219,20 @@ def future(request):
             'future': 0,
             'now': 0
         }
-    for subscription in SubscriptionDao.all_active_subscritions():
-        for subscription_size in subscriptionsizes:
-            subscription_lines[subscription_size]['now'] += subscription.subscription_amount(
-                subscription_size)
-        for users_subscription in subscription.extra_subscriptions.all():
-            extra_lines[users_subscription.type.name]['now'] += 1
-
-    for subscription in SubscriptionDao.future_subscriptions():
-        for subscription_size in subscriptionsizes:
-            subscription_lines[subscription_size]['future'] += subscription.subscription_amount_future(
-                subscription_size)
-        for users_subscription in subscription.future_extra_subscriptions.all():
-            extra_lines[users_subscription.type.name]['future'] += 1
+    active_subscriptions = SubscriptionDao.all_active_subscritions()
+    future_subscriptions = SubscriptionDao.future_subscriptions()
+    for amount in SubscriptionTypeDao.size_amounts(active_subscriptions):
+        subscription_lines[amount['type__size']]['now'] += amount['amount']
+    for amount in SubscriptionTypeDao.future_size_amounts(future_subscriptions):
+        subscription_lines[amount['type__size']]['future'] += amount['amount']
+    for amount in ExtraSubscriptionDao.type_amounts(active_subscriptions, future_subscriptions):
+        extra_lines[amount['type__name']]['now'] += amount['now']
+        extra_lines[amount['type__name']]['future'] += amount['future']
 
     renderdict.update({
         'changed': request.GET.get('changed'),
-        'subscription_lines': iter(subscription_lines.values()),
-        'extra_lines': iter(extra_lines.values()),
+        'subscription_lines': list(subscription_lines.values()),
+        'extra_lines': list(extra_lines.values()),
     })
     return render(request, 'future.html', renderdict)
 
@@ -257,10 +250,7 @@ def get_mail_template(request, template_id):
 
 @permission_required('juntagrico.is_operations_group')
 def excel_export_members_filter(request):
-    response = HttpResponse(content_type='application/vnd.ms-excel')
-    response['Content-Disposition'] = 'attachment; filename=Report.xlsx'
-    output = BytesIO()
-    workbook = Workbook(output)
+    output, workbook = streaming_workbook()
     worksheet_s = workbook.add_worksheet(Config.vocabulary('member_pl'))
 
     worksheet_s.write_string(0, 0, str(_('Name')))
@@ -272,13 +262,14 @@ def excel_export_members_filter(request):
     worksheet_s.write_string(0, 5, str(_('Email')))
     worksheet_s.write_string(0, 6, str(_('Telefon')))
     worksheet_s.write_string(0, 7, str(_('Mobile')))
-    members = MemberDao.members_with_assignments_count()
+    members = MemberDao.members_with_assignments_count().select_related('subscription__depot')
+    area_names = {}
+    for member_id, area_name in ActivityAreaDao.area_names_by_member():
+        area_names[member_id] = area_names.get(member_id, '') + area_name + ' '
 
     row = 1
-    for member in members:
-        member.all_areas = ''
-        for area in member.areas.all():
-            member.all_areas = member.all_areas + area.name + ' '
+    for member in members.iterator():
+        member.all_areas = area_names.get(member.pk, '')
         if member.all_areas == '':
             member.all_areas = str(_('-Kein Tätigkeitsbereich-'))
 
@@ -298,9 +289,7 @@ def excel_export_members_filter(request):
         row += 1
 
     workbook.close()
-    xlsx_data = output.getvalue()
-    response.write(xlsx_data)
-    return response
+    return workbook_response(output, 'Report')
 
 
 @permission_required('juntagrico.is_operations_group')
@@ -366,11 +355,8 @@ def canceledlist(request):
 def typechangelist(request):
     render_dict = get_menu_dict(request)
     render_dict.update(get_changedate(request))
-    changedlist = []
-    subscriptions_list = SubscriptionDao.all_active_subscritions()
-    for subscription in subscriptions_list:
-        if subscription.types_changed:
-            changedlist.append(subscription)
+    changedlist = SubscriptionDao.subscriptions_with_changed_types(SubscriptionDao.all_active_subscritions())\
+        .select_related('primary_member').prefetch_related('types__size__product', 'future_types__size__product', active_extra_subscriptions_prefetch())
     return subscription_management_list(changedlist, render_dict, 'management_lists/typechangelist.html', request)
 
 
@@ -1,11 +1,12 @@
 from django.contrib.auth import logout
 from django.contrib.auth.decorators import login_required, permission_required
 from django.core.exceptions import ValidationError
-from django.http import Http404
+from django.http import Http404, HttpResponseBadRequest
 from django.shortcuts import render, get_object_or_404, redirect
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.decorators import method_decorator
+from django.utils.translation import gettext as _
 from django.views.generic import FormView
 from django.views.generic.edit import ModelFormMixin
 from juntagrico.view_decorators import primary_member_of_subscription, create_subscription_session
@@ -24,7 +25,7 @@ from juntagrico.entity.subtypes import TSST, TFSST
 from juntagrico.forms import RegisterMemberForm, EditMemberForm, AddCoMemberForm, SubscriptionTypeEditForm
 from juntagrico.mailer import membernotification
 from juntagrico.util import addons
-from juntagrico.util import temporal, return_to_previous_location
+from juntagrico.util import management, temporal, return_to_previous_location
 from juntagrico.util.management import cancel_sub, cancel_extra_sub
 from juntagrico.util.management import create_or_update_co_member, replace_subscription_types, create_share
 from juntagrico.util.temporal import end_of_next_business_year, next_cancelation_date, end_of_business_year, \
@@ -300,32 +301,48 @@ class AddCoMemberView(FormView, ModelFormMixin):
 
 @permission_required('juntagrico.is_operations_group')
 def activate_subscription(request, subscription_id):
-    subscription = get_object_or_404(Subscription, id=subscription_id)
-    change_date = request.session.get('changedate', None)
-    if subscription.active is False and subscription.deactivation_date is None:
-        try:
-            subscription.active = True
-            subscription.activation_date = change_date
-            subscription.save()
-        except ValidationError:
-            renderdict = get_menu_dict(request)
-            return render(request, 'activation_error.html', renderdict)
-    return return_to_previous_location(request)
+    get_object_or_404(Subscription, id=subscription_id)
+    return change_subscriptions_intern(request, management.activate_subscriptions, [subscription_id])
 
 
 @permission_required('juntagrico.is_operations_group')
 def deactivate_subscription(request, subscription_id):
-    subscription = get_object_or_404(Subscription, id=subscription_id)
+    get_object_or_404(Subscription, id=subscription_id)
+    return change_subscriptions_intern(request, management.deactivate_subscriptions, [subscription_id])
+
+
+@permission_required('juntagrico.is_operations_group')
+def activate_subscriptions(request):
+    if request.method != 'POST':
+        raise Http404
+    return change_posted_subscriptions(request, management.activate_subscriptions)
+
+
+@permission_required('juntagrico.is_operations_group')
+def deactivate_subscriptions(request):
+    if request.method != 'POST':
+        raise Http404
+    return change_posted_subscriptions(request, management.deactivate_subscriptions)
+
+
+def change_posted_subscriptions(request, change):
+    try:
+        subscription_ids = [int(subscription_id) for subscription_id in request.POST.getlist('subscriptions')]
+    except ValueError:
+        return HttpResponseBadRequest(_('Ungültige Parameter'))
+    return change_subscriptions_intern(request, change, subscription_ids)
+
+
+def change_subscriptions_intern(request, change, subscription_ids):
     change_date = request.session.get('changedate', None)
-    if subscription.active is True:
-        subscription.active = False
-        subscription.deactivation_date = change_date
-        subscription.save()
-        for extra in subscription.extra_subscription_set.all():
-            if extra.active is True:
-                extra.active = False
-                extra.deactivation_date = change_date
-                extra.save()
+    try:
+        change(subscription_ids, change_date)
+    except ValidationError as error:
+        renderdict = get_menu_dict(request)
+        renderdict.update({
+            'error': ' '.join(error.messages)
+        })
+        return render(request, 'activation_error.html', renderdict)
     return return_to_previous_location(request)
 
 
@@ -1,5 +1,8 @@
+from django.contrib.auth.models import Permission
 from django.urls import reverse
 
+from juntagrico.entity.jobs import RecuringJob
+
 from test.util.test import JuntagricoTestCase
 
 
@@ -13,3 +16,47 @@ class AdminTests(JuntagricoTestCase):
 
     def testSubAdmin(self):
         self.assertGet(reverse('admin:juntagrico_subscription_change', args=(self.sub.pk,)), member=self.admin)
+
+    def testJobAdminFreeSlots(self):
+        url = reverse('admin:juntagrico_recuringjob_changelist')
+        response = self.assertGet(url + '?free_slots=full', member=self.admin)
+        self.assertEqual(list(response.context['cl'].result_list), [self.job2])
+        response = self.assertGet(url + '?free_slots=free&o=-5', member=self.admin)
+        self.assertNotIn(self.job2, response.context['cl'].result_list)
+        self.assertEqual(response.context['cl'].result_list[0], self.job4)
+        self.job3.infinite_slots = True
+        self.job3.save()
+        response = self.assertGet(url + '?o=-5', member=self.admin)
+        self.assertEqual(response.context['cl'].result_list[0], self.job3)
+        response = self.assertGet(url + '?o=5', member=self.admin)
+        self.assertEqual(response.context['cl'].result_list[len(response.context['cl'].result_list) - 1], self.job3)
+
+    def testJobCopy(self):
+        url = reverse('admin:juntagrico_recuringjob_changelist') + 'copy_job/{}/'.format(self.job1.pk)
+        self.assertGet(url, member=self.admin)
+        data = {'type': self.job_type.pk, 'slots': 2, 'weekdays': ['1', '3'], 'time': '09:00', 'start_date': '2020-06-01',
+                'end_date': '2020-06-14', 'weekly': '7'}
+        count = RecuringJob.objects.count()
+        response = self.assertPost(url, dict(data, _preview='Vorschau'), member=self.admin)
+        self.assertContains(response, 'Vorschau: 4 neue Jobs am')
+        self.assertContains(response, '01.06.2020, 03.06.2020, 08.06.2020, 10.06.2020')
+        self.assertFalse(response.context['errors'])
+        self.assertEqual(RecuringJob.objects.count(), count)
+        response = self.assertPost(url, dict(data, _preview='Vorschau', end_date='2020-05-01'), member=self.admin)
+        self.assertTrue(response.context['errors'])
+        self.assertPost(url, data, 302, member=self.admin)
+        self.assertEqual(RecuringJob.objects.count(), count + 4)
+
+    def testCancelJobsAction(self):
+        url = reverse('admin:juntagrico_recuringjob_changelist')
+        self.assertPost(url, {'action': 'cancel_jobs', '_selected_action': [self.job1.pk, self.job2.pk]}, 302, member=self.admin)
+        self.assertEqual(RecuringJob.objects.filter(canceled=True).count(), 2)
+
+    def testCancelJobsActionPermission(self):
+        view_permission = Permission.objects.get(codename='view_recuringjob')
+        self.member2.user.is_staff = True
+        self.member2.user.save()
+        self.member2.user.user_permissions.add(view_permission)
+        url = reverse('admin:juntagrico_recuringjob_changelist')
+        self.assertPost(url, {'action': 'cancel_jobs', '_selected_action': [self.job1.pk]}, 302, member=self.member2)
+        self.assertFalse(RecuringJob.objects.filter(canceled=True).exists())
@@ -0,0 +1,43 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+
+from juntagrico.entity.member import Member
+from juntagrico.util.benchmark import BENCHMARK_EMAIL, TARGETS
+
+from test.util.test import JuntagricoTestCase
+
+
+class BenchmarkTests(JuntagricoTestCase):
+
+    def testBenchmark(self):
+        out = StringIO()
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'benchmark.json')
+            call_command('benchmark', '--members', '30', '--jobs', '5', '--assignments', '50', '--repeat', '1',
+                         '--output', filename, stdout=out)
+            with open(filename) as result_file:
+                results = json.load(result_file)
+            self.assertEqual(list(results), TARGETS)
+            for result in results.values():
+                self.assertGreater(result['queries'], 0)
+            out = StringIO()
+            call_command('benchmark', '--target', 'home', '--target', 'job', '--repeat', '2', '--baseline', filename,
+                         stdout=out)
+        report = out.getvalue()
+        self.assertIn('Δ queries', report)
+        self.assertIn('job', report)
+        self.assertNotIn('filter-subs', report)
+
+    def testBenchmarkRollsBack(self):
+        members = Member.objects.count()
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            call_command('benchmark', '--members', '10', '--jobs', '2', '--assignments', '5', '--repeat', '1',
+                         '--target', 'home', '--target', 'generate_depot_list', stdout=StringIO())
+            self.assertEqual(os.listdir(media_root), [])
+        self.assertEqual(Member.objects.count(), members)
+        self.assertFalse(Member.objects.filter(email=BENCHMARK_EMAIL).exists())
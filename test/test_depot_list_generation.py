@@ -1,8 +1,18 @@
 from io import StringIO
 
+from django.core.files.storage import default_storage
 from django.core.management import call_command
+from django.template.loader import get_template
 from django.utils import timezone
 
+from juntagrico.dao.depotdao import DepotDao
+from juntagrico.dao.extrasubscriptioncategorydao import ExtraSubscriptionCategoryDao
+from juntagrico.dao.listmessagedao import ListMessageDao
+from juntagrico.dao.subscriptiondao import SubscriptionDao
+from juntagrico.dao.subscriptionproductdao import SubscriptionProductDao
+from juntagrico.entity.extrasubs import ExtraSubscription
+from juntagrico.entity.subtypes import TSST
+from juntagrico.util.depot_list import depot_fragment_name, depot_list_matrix, FRAGMENT_DIR
 from test.util.test import JuntagricoTestCase
 
 
@@ -12,3 +22,73 @@ class DepotlistTests(JuntagricoTestCase):
         out = StringIO()
         call_command('generate_depot_list', '--force', stdout=out)
         self.assertEqual(out.getvalue(), '')
+
+    def test_depot_list_sequential(self):
+        out = StringIO()
+        call_command('generate_depot_list', '--force', '--processes', '1', stdout=out)
+        self.assertEqual(out.getvalue(), '')
+        for filename in ['depotlist.pdf', 'depot_overview.pdf', 'amount_overview.pdf']:
+            self.assertTrue(default_storage.exists(filename))
+
+    def fragments(self):
+        if not default_storage.exists(FRAGMENT_DIR):
+            return set()
+        return set(default_storage.listdir(FRAGMENT_DIR)[1])
+
+    def test_depot_list_fragments(self):
+        for fragment in self.fragments():
+            default_storage.delete(FRAGMENT_DIR + '/' + fragment)
+        call_command('generate_depot_list', '--force', '--processes', '1')
+        fragments = self.fragments()
+        self.assertEqual(len(fragments), 2)
+        call_command('generate_depot_list', '--force', '--processes', '1')
+        self.assertEqual(self.fragments(), fragments)
+        TSST.objects.create(subscription=self.sub, type=self.sub_type2)
+        call_command('generate_depot_list', '--force', '--processes', '1')
+        changed = self.fragments()
+        self.assertEqual(len(changed), 2)
+        self.assertEqual(changed & fragments, {f for f in fragments if f.startswith('{}-'.format(self.depot2.pk))})
+
+    def depot_dict(self):
+        depot_dict = {
+            'products': SubscriptionProductDao.get_all(),
+            'depots': DepotDao.all_depots_order_by_code(),
+            'messages': list(ListMessageDao.all_active()),
+        }
+        depot_dict.update(depot_list_matrix(SubscriptionDao.all_active_subscritions(), depot_dict['products'],
+                                            ExtraSubscriptionCategoryDao.categories_for_depot_list_ordered(),
+                                            depot_dict['depots']))
+        return depot_dict
+
+    def test_depot_fragment_name(self):
+        depot_dict = self.depot_dict()
+        name = depot_fragment_name(self.depot, depot_dict, ['list', 'header', 'style'])
+        self.assertEqual(depot_fragment_name(self.depot, depot_dict, ['list', 'header', 'style']), name)
+        self.assertNotEqual(depot_fragment_name(self.depot, depot_dict, ['list', 'changed header', 'style']), name)
+        self.assertNotEqual(depot_fragment_name(self.depot, depot_dict, ['list', 'header', 'changed style']), name)
+
+    def test_depot_fragment_without_creation_time(self):
+        depot_dict = self.depot_dict()
+        fragment = get_template('exports/depotlist.html').render(dict(depot_dict, depots=[self.depot]))
+        self.assertNotIn('Erstellt am', fragment)
+        self.assertIn('Erstellt am', get_template('exports/depotlist_cover.html').render(depot_dict))
+
+    def test_depot_list_matrix(self):
+        TSST.objects.create(subscription=self.sub, type=self.sub_type2)
+        ExtraSubscription.objects.create(main_subscription=self.sub, type=self.esub_type, active=True,
+                                         activation_date=timezone.now().date())
+        ExtraSubscription.objects.create(main_subscription=self.sub, type=self.esub_type, active=False)
+        with self.assertNumQueries(9):
+            matrix = depot_list_matrix(SubscriptionDao.all_active_subscritions(), SubscriptionProductDao.get_all(),
+                                       ExtraSubscriptionCategoryDao.categories_for_depot_list_ordered(),
+                                       DepotDao.all_depots_order_by_code())
+        self.assertEqual(matrix['depot_subscriptions'][self.depot.pk],
+                         [{'subscription': self.sub, 'recipients_names': self.sub.recipients_names(), 'amounts': [2, 1]}])
+        self.assertEqual(matrix['depot_subscriptions'][self.depot2.pk], [])
+        self.assertEqual(matrix['depot_totals'][self.depot.pk], [2, 1])
+        self.assertEqual(matrix['depot_totals'][self.depot2.pk], [0, 0])
+        self.assertEqual(matrix['weekday_depots'][1], [self.depot, self.depot2])
+        self.assertEqual(matrix['weekday_totals'][1], [2, 1])
+        self.assertEqual(matrix['weekday_units'][1], 2)
+        self.assertEqual(matrix['totals'], [2, 1])
+        self.assertEqual(matrix['total_units'], 2)
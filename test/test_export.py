@@ -5,14 +5,33 @@ from test.util.test import JuntagricoTestCase
 
 class ExportTests(JuntagricoTestCase):
 
+    def assertExcelDownload(self, url):
+        self.client.force_login(self.member.user)
+        return self.assertExcelResponse(url)
+
+    def assertExcelResponse(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+        self.assertTrue(response['Content-Disposition'].startswith('attachment'))
+        self.assertEqual(b''.join(response.streaming_content)[:2], b'PK')
+        return response
+
     def testExport(self):
         self.assertGet(reverse('export'))
 
     def testMembersfilterExport(self):
-        self.assertGet(reverse('export-membersfilter'))
+        self.assertExcelDownload(reverse('export-membersfilter'))
+
+    def testMembersfilterExportQueries(self):
+        self.area.members.add(self.member2)
+        self.client.force_login(self.member.user)
+        # session, user, permissions, area names and members including their depot
+        with self.assertNumQueries(6):
+            self.assertExcelResponse(reverse('export-membersfilter'))
 
     def testMembersExport(self):
-        self.assertGet(reverse('export-members'))
+        self.assertExcelDownload(reverse('export-members'))
 
     def testSharesExport(self):
-        self.assertGet(reverse('export-shares'))
+        self.assertExcelDownload(reverse('export-shares'))
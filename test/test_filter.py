@@ -1,4 +1,8 @@
 from django.urls import reverse
+from django.utils import timezone
+
+from juntagrico.entity.extrasubs import ExtraSubscription
+from juntagrico.entity.jobs import Assignment, Job
 
 from test.util.test import JuntagricoTestCase
 
@@ -8,6 +12,20 @@ class FilterTests(JuntagricoTestCase):
     def testSubscrition(self):
         self.assertGet(reverse('filter-subs'))
 
+    def testSubscriptionAssignments(self):
+        Assignment.objects.create(job=self.job1, member=self.member3, amount=2)
+        Assignment.objects.create(job=self.job1, member=self.member2, amount=1)
+        Assignment.objects.create(job=self.job3, member=self.member, amount=1)
+        ExtraSubscription.objects.create(main_subscription=self.sub, type=self.esub_type, active=True)
+        Job.objects.filter(pk__in=[self.job1.pk, self.job2.pk]).update(time=timezone.now() - timezone.timedelta(minutes=1))
+        response = self.assertGet(reverse('filter-subs'))
+        row, = response.context['subscriptions']
+        self.assertEqual(row['subscription'], self.sub)
+        self.assertEqual(row['assignments'], 3)
+        self.assertEqual(row['recipients'], [self.member, self.member3])
+        self.assertContains(response, self.sub.overview)
+        self.assertIn('Extrasub_Type', self.sub.overview)
+
     def testSubscritionDepot(self):
         url = reverse('filter-subs-depot', args=[self.depot.pk])
         self.assertGet(url)
@@ -1,6 +1,10 @@
 from io import StringIO
 
 from django.core.management import call_command
+from django.urls import reverse
+
+from juntagrico.entity.jobs import Assignment
+from juntagrico.entity.member import Member
 
 from test.util.test import JuntagricoTestCase
 
@@ -11,3 +15,27 @@ class TestdataTests(JuntagricoTestCase):
         out = StringIO()
         call_command('generate_testdata', stdout=out)
         self.assertEqual(out.getvalue(), '')
+
+    def test_bulk_testdata(self):
+        members = Member.objects.count()
+        out = StringIO()
+        call_command('generate_testdata_bulk', '--members', '60', '--depots', '3', '--jobs', '10',
+                     '--assignments', '200', stdout=out)
+        self.assertIn('60 members, 3 depots', out.getvalue())
+        self.assertEqual(Member.objects.count(), members + 60)
+        self.assertEqual(Assignment.objects.filter(member__email__endswith='@testdata.juntagrico').count(), 200)
+        member = Member.objects.filter(subscription__isnull=False, email__endswith='@testdata.juntagrico').first()
+        self.assertGreater(member.subscription.required_assignments, 0)
+        self.assertIn(member, member.subscription.recipients)
+        self.assertGet(reverse('home'), member=member)
+        # new objects still get free primary keys
+        self.create_member('after@email.org')
+
+    def test_bulk_testdata_seed(self):
+        call_command('generate_testdata_bulk', '--members', '20', '--seed', '3', stdout=StringIO())
+        names = list(Member.objects.filter(email__endswith='@testdata.juntagrico').order_by('pk')
+                     .values_list('first_name', 'last_name'))
+        Member.objects.filter(email__endswith='@testdata.juntagrico').update(first_name='')
+        call_command('generate_testdata_bulk', '--members', '20', '--seed', '3', stdout=StringIO())
+        self.assertEqual(list(Member.objects.filter(email__endswith='@testdata.juntagrico').exclude(first_name='')
+                              .order_by('pk').values_list('first_name', 'last_name')), names)
@@ -1,5 +1,17 @@
+import datetime
+from io import StringIO
+
+from django.core import mail
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
 from django.urls import reverse
+from django.utils import timezone
 
+from juntagrico.dao.assignmentdao import AssignmentDao
+from juntagrico.dao.jobdao import JobDao
+from juntagrico.entity.jobs import Assignment, Job, RecuringJob
+from juntagrico.util.jobs import job_date_text, job_series_dates
+from juntagrico.util.management import cancel_jobs, create_job_series, sign_up_for_job
 from test.util.test import JuntagricoTestCase
 
 
@@ -19,6 +31,7 @@ class JobTests(JuntagricoTestCase):
 
     def testJobPost(self):
         self.assertPost(reverse('job', args=[self.job1.pk]), {'jobs': 1}, 302)
+        self.job1.refresh_from_db()
         self.assertEqual(self.job1.free_slots, 0)
         self.assertEqual(self.job1.assignment_set.first().amount, 1)
 
@@ -38,7 +51,234 @@ class JobTests(JuntagricoTestCase):
         self.assertEqual(self.job4.assignment_set.count(), 5)
         self.assertGet(reverse('job', args=[self.job4.pk]))
 
+    def testJobOverbooking(self):
+        response = self.assertPost(reverse('job', args=[self.job1.pk]), {'jobs': 2})
+        self.assertContains(response, 'nur noch 1 Plätze frei')
+        self.assertEqual(self.job1.assignment_set.count(), 0)
+        self.assertPost(reverse('job', args=[self.job1.pk]), {'jobs': 1}, 302)
+        self.assertPost(reverse('job', args=[self.job1.pk]), {'jobs': 1}, member=self.member2)
+        self.assertEqual(self.job1.assignment_set.count(), 1)
+
+    def testSignUpForJob(self):
+        assignments = sign_up_for_job(self.job4, self.member2, 3, [str(self.job_extra_type.id)])
+        self.assertEqual(self.job4.assignment_set.filter(member=self.member2, amount=1).count(), 3)
+        self.assertEqual(assignments[-1].job_extras.get(), self.job_extra)
+        with self.assertRaises(ValidationError):
+            sign_up_for_job(self.job4, self.member3, 4)
+        sign_up_for_job(self.job4, self.member3, 3)
+        self.assertEqual(self.job4.free_slots, 0)
+        Job.objects.filter(pk=self.job5.pk).update(time=timezone.now() - timezone.timedelta(minutes=1))
+        self.job5.refresh_from_db()
+        with self.assertRaises(ValidationError):
+            sign_up_for_job(self.job5, self.member3, 1)
+        Job.objects.filter(pk=self.job5.pk).update(infinite_slots=True)
+        with self.assertRaises(ValidationError):
+            sign_up_for_job(self.job5, self.member3, 1)
+        Job.objects.filter(pk=self.job4.pk).update(infinite_slots=True, canceled=True)
+        with self.assertRaises(ValidationError):
+            sign_up_for_job(self.job4, self.member3, 1)
+
+    def testOccupiedSlots(self):
+        def occupied_slots(job):
+            return Job.objects.get(pk=job.pk).occupied_slots
+        self.assertEqual(occupied_slots(self.job2), 1)
+        assignment = Assignment.objects.create(job=self.job4, member=self.member, amount=1)
+        sign_up_for_job(self.job4, self.member2, 2)
+        self.assertEqual(occupied_slots(self.job4), 3)
+        assignment = Assignment.objects.get(pk=assignment.pk)
+        assignment.job = self.job5
+        assignment.save()
+        self.assertEqual(occupied_slots(self.job4), 2)
+        self.assertEqual(occupied_slots(self.job5), 1)
+        assignment.delete()
+        self.assertEqual(occupied_slots(self.job5), 0)
+        # an outdated instance does not overwrite the counter
+        self.job4.slots = 5
+        self.job4.occupied_slots = 0
+        self.job4.save()
+        self.assertEqual(occupied_slots(self.job4), 2)
+        self.assertEqual(Job.objects.get(pk=self.job4.pk).free_slots, 3)
+
+    def testRebuildOccupiedSlots(self):
+        Job.objects.update(occupied_slots=0)
+        call_command('rebuild_occupied_slots', stdout=StringIO())
+        self.assertEqual(Job.objects.get(pk=self.job2.pk).occupied_slots, 1)
+        self.assertEqual(Job.objects.get(pk=self.job1.pk).occupied_slots, 0)
+
+    def testJobSeriesDates(self):
+        start = datetime.date(2020, 6, 1)
+        end = datetime.date(2020, 6, 30)
+        self.assertEqual(job_series_dates(start, end, ['1', '3'])[:3],
+                         [datetime.date(2020, 6, 1), datetime.date(2020, 6, 3), datetime.date(2020, 6, 8)])
+        self.assertEqual(job_series_dates(start, end, [1], 14),
+                         [datetime.date(2020, 6, 1), datetime.date(2020, 6, 15), datetime.date(2020, 6, 29)])
+
+    def testCreateJobSeries(self):
+        dates = [datetime.date(2020, 6, 1), datetime.date(2020, 6, 8)]
+        job_ids = create_job_series(self.job_type, dates, datetime.time(9, 30), 3)
+        jobs = list(RecuringJob.objects.filter(id__in=job_ids).order_by('time'))
+        self.assertEqual([job.id for job in jobs], job_ids)
+        self.assertEqual([timezone.localtime(job.time).date() for job in jobs], dates)
+        self.assertEqual(timezone.localtime(jobs[0].time).time(), datetime.time(9, 30))
+        self.assertEqual(jobs[0].type, self.job_type)
+        self.assertEqual(jobs[0].free_slots, 3)
+        # the new jobs are complete polymorphic jobs
+        self.assertIsInstance(Job.objects.get(pk=job_ids[0]), RecuringJob)
+        # the created jobs can be saved like any other
+        job = jobs[1]
+        job.slots = 4
+        job.save()
+        self.assertEqual(RecuringJob.objects.get(pk=job.pk).slots, 4)
+
+    def testCreateJobSeriesCommand(self):
+        args = [self.job_type.name, '--start', '2020-06-01', '--end', '2020-06-30', '--weekday', '1', '--time', '10:00',
+                '--slots', '2']
+        count = RecuringJob.objects.count()
+        out = StringIO()
+        call_command('create_job_series', *args, '--preview', stdout=out)
+        self.assertIn('5 jobs per type', out.getvalue())
+        self.assertEqual(RecuringJob.objects.count(), count)
+        call_command('create_job_series', *args, stdout=StringIO())
+        self.assertEqual(RecuringJob.objects.filter(type=self.job_type, slots=2).count(), 5)
+
+    def testCancelJobs(self):
+        for member in [self.member, self.member2, self.member3]:
+            sign_up_for_job(self.job4, member, 2, [str(self.job_extra_type.id)])
+        mail.outbox = []
+        # including the job type rendered in each of the two mails
+        with self.assertNumQueries(14):
+            count = cancel_jobs(Job.objects.filter(pk__in=[self.job1.pk, self.job2.pk, self.job4.pk]))
+        self.assertEqual(count, 3)
+        self.assertFalse(Assignment.objects.filter(job__in=[self.job2, self.job4]).exists())
+        job4 = Job.objects.get(pk=self.job4.pk)
+        self.assertTrue(job4.canceled)
+        self.assertEqual((job4.slots, job4.occupied_slots), (0, 0))
+        # one mail for each job with participants
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(sorted(len(email.bcc) for email in mail.outbox), [1, 3])
+        self.assertEqual(cancel_jobs(Job.objects.filter(pk=self.job4.pk)), 0)
+
+    def testSlotRecountSuspended(self):
+        with AssignmentDao.slot_recount_suspended():
+            Assignment.objects.create(job=self.job4, member=self.member, amount=1)
+        self.assertEqual(Job.objects.get(pk=self.job4.pk).occupied_slots, 0)
+        self.assertFalse(AssignmentDao.slot_recount_is_suspended())
+        Assignment.objects.create(job=self.job4, member=self.member, amount=1)
+        self.assertEqual(Job.objects.get(pk=self.job4.pk).occupied_slots, 2)
+
+    def testCancelJob(self):
+        self.job2.canceled = True
+        self.job2.save()
+        self.assertFalse(Assignment.objects.filter(job=self.job2).exists())
+        self.assertEqual(Job.objects.get(pk=self.job2.pk).occupied_slots, 0)
+        self.assertEqual(len(mail.outbox), 1)
+
+    def testJobDetail(self):
+        for member in [self.member, self.member3, self.member]:
+            Assignment.objects.create(job=self.job4, member=member, amount=1)
+        self.job4.assignment_set.first().job_extras.add(self.job_extra)
+        response = self.assertGet(reverse('job', args=[self.job4.pk]))
+        self.assertEqual(response.context['number_of_participants'], 3)
+        summary = response.context['participants_summary']
+        self.assertEqual([(name, extras) for name, url, reachable, extras in summary],
+                         [('first_name last_name (mit einer weiteren Person)', 'full'), ('first_name last_name', '')])
+        job = response.context['job']
+        self.assertEqual(job.free_slots, 3)
+        self.assertEqual(job.full_per_job_extras(), [self.job_extra])
+        self.assertEqual(job.empty_per_job_extras(), [])
+
     def testHours(self):
         with self.settings(ASSIGNMENT_UNIT='HOURS'):
             self.assertPost(reverse('job', args=[self.job5.pk]), {'jobs': 1}, 302)
             self.assertEqual(self.job5.assignment_set.first().amount, 2)
+
+    def testJobsForList(self):
+        assignment = Assignment.objects.create(job=self.job4, member=self.member, amount=1)
+        assignment.job_extras.add(self.job_extra)
+        with self.assertNumQueries(5):
+            jobs = JobDao.jobs_for_list(JobDao.jobs_ordered_by_time())
+            for job in jobs:
+                job.extras(), job.free_slots, job.get_status_percentage(), job.get_css_classes, job.end_time()
+                job.type.activityarea.core
+        jobs = {job.id: job for job in jobs}
+        for job in [self.job1, self.job2, self.job4, self.one_time_job1]:
+            job.refresh_from_db()
+            self.assertEqual(jobs[job.id].free_slots, job.free_slots)
+            self.assertEqual(jobs[job.id].get_status_percentage(), job.get_status_percentage())
+            self.assertEqual(jobs[job.id].extras(), job.extras())
+            self.assertEqual(jobs[job.id].get_css_classes, job.get_css_classes)
+            self.assertEqual(jobs[job.id].end_time(), job.end_time())
+
+    def testAllJobsData(self):
+        self.assertGet(reverse('jobs-all-data'))
+        self.client.force_login(self.member.user)
+        data = {
+            'draw': 3,
+            'start': 0,
+            'length': 2,
+            'columns[0][data]': '',
+            'columns[1][data]': 'date',
+            'columns[2][data]': 'job',
+            'columns[2][search][value]': 'name',
+            'order[0][column]': 1,
+            'order[0][dir]': 'desc',
+        }
+        response = self.client.get(reverse('jobs-all-data'), data).json()
+        self.assertEqual(response['draw'], 3)
+        self.assertEqual(response['recordsTotal'], 6)
+        self.assertEqual(response['recordsFiltered'], 6)
+        self.assertEqual(len(response['data']), 2)
+        data['search[value]'] = 'nothing'
+        response = self.client.get(reverse('jobs-all-data'), data).json()
+        self.assertEqual(response['recordsFiltered'], 0)
+        self.assertEqual(response['data'], [])
+        for parameter in ['area', 'start', 'length', 'draw']:
+            response = self.client.get(reverse('jobs-all-data'), dict(data, **{parameter: 'x'}))
+            self.assertEqual(response.status_code, 400)
+
+    def testAllJobsDataDateSearch(self):
+        def matching(text):
+            return len([job for job in Job.objects.all() if text in job_date_text(timezone.localtime(job.time))])
+
+        self.client.force_login(self.member.user)
+        date = job_date_text(timezone.localtime(self.job1.time))
+        data = {'columns[0][data]': 'date', 'length': 100}
+        for text in [date, date[3:], date[-7:], date[:2], date[3:6]]:
+            response = self.client.get(reverse('jobs-all-data'), dict(data, **{'columns[0][search][value]': text})).json()
+            self.assertEqual(response['recordsFiltered'], matching(text))
+            self.assertGreater(response['recordsFiltered'], 0)
+            response = self.client.get(reverse('jobs-all-data'), dict(data, **{'search[value]': text})).json()
+            self.assertEqual(response['recordsFiltered'], matching(text))
+        response = self.client.get(reverse('jobs-all-data'), dict(data, **{'columns[0][search][value]': '32.'})).json()
+        self.assertEqual(response['recordsFiltered'], 0)
+
+    def testAllJobsDataArea(self):
+        self.client.force_login(self.member.user)
+        response = self.client.get(reverse('jobs-all-data'), {'area': self.area.pk}).json()
+        self.assertEqual(response['recordsTotal'], JobDao.jobs_by_area(self.area.pk).count())
+        self.assertGreater(response['recordsTotal'], 0)
+        response = self.client.get(reverse('jobs-all-data'), {'area': self.area2.pk}).json()
+        self.assertEqual(response['recordsTotal'], 0)
+
+    def testRemindMembers(self):
+        Assignment.objects.create(job=self.one_time_job1, member=self.member2, amount=1)
+        Assignment.objects.create(job=self.job2, member=self.member3, amount=1)
+        mail.outbox = []
+        # recuring jobs, one time jobs, the assignments of both and the update
+        with self.assertNumQueries(5):
+            call_command('remind_members', stdout=StringIO())
+        # jobs without participants have no recipients
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertFalse(Job.objects.filter(reminder_sent=False).exists())
+        reminder = next(email for email in mail.outbox if 'email3@email.org' in email.bcc)
+        self.assertEqual(reminder.bcc, ['email1@email.org', 'email3@email.org'])
+        self.assertIn(str(self.member), reminder.body)
+        mail.outbox = []
+        call_command('remind_members', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 0)
+
+    def testRemindMembersConcurrently(self):
+        mail.outbox = []
+        call_command('remind_members', '--workers', '3', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertFalse(Job.objects.filter(reminder_sent=False).exists())
@@ -1,3 +1,5 @@
+from django.core import mail
+from django.test import override_settings
 from django.urls import reverse
 
 from test.util.test import JuntagricoTestCase
@@ -26,3 +28,20 @@ class MailerTests(JuntagricoTestCase):
     def testMailResult(self):
         self.assertGet(reverse('mail-result', args=[1]))
         self.assertGet(reverse('mail-result', args=[1]))
+
+    @override_settings(MAIL_BATCH_SIZE=2)
+    def testMailSendBatched(self):
+        post_data = {
+            'sender': 'test@mail.org',
+            'subject': 'subject',
+            'recipients': 'test1@mail.org test2@mail.org test3@mail.org',
+            'allsingleemail': 'on',
+            'singleemail': 'test4@mail.org test5@mail.org',
+        }
+        mail.outbox = []
+        self.assertPost(reverse('mail-send'), post_data, code=302)
+        self.assertEqual([m.bcc for m in mail.outbox], [
+            ['test1@mail.org', 'test2@mail.org'],
+            ['test3@mail.org', 'test4@mail.org'],
+            ['test5@mail.org']
+        ])
@@ -0,0 +1,85 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from juntagrico.dao.assignmentdao import AssignmentDao
+from juntagrico.entity.jobs import Assignment, RecuringJob
+from juntagrico.util.management import replace_subscription_types
+from juntagrico.util import menu
+from juntagrico.util.menu import menu_cache_stats
+from test.util.test import JuntagricoTestCase
+
+
+class MenuCacheTests(JuntagricoTestCase):
+
+    def testMenuCache(self):
+        cache.clear()
+        self.assertGet(reverse('home'))
+        self.assertEqual(menu_cache_stats()['misses'], 1)
+        self.assertGet(reverse('home'))
+        self.assertEqual(menu_cache_stats()['hits'], 1)
+        Assignment.objects.create(job=self.job1, member=self.member, amount=1)
+        self.assertGet(reverse('home'))
+        self.assertEqual(menu_cache_stats()['misses'], 2)
+        self.assertEqual(menu_cache_stats()['hit_rate'], 1 / 3)
+
+    def testMenuCacheInvalidation(self):
+        cache.clear()
+        self.assertGet(reverse('home'))
+        self.sub_type.required_assignments = 20
+        self.sub_type.save()
+        self.assertGet(reverse('home'))
+        self.assertEqual(menu_cache_stats()['misses'], 2)
+        replace_subscription_types(self.sub, {self.sub_type2: 1})
+        self.assertGet(reverse('home'))
+        self.assertEqual(menu_cache_stats()['misses'], 3)
+
+    def testMenuCacheInvalidationPerMember(self):
+        cache.clear()
+        self.assertGet(reverse('home'))
+        Assignment.objects.create(job=self.job1, member=self.member2, amount=1)
+        self.assertGet(reverse('home'))
+        self.assertEqual(menu_cache_stats()['misses'], 1)
+        # a partner in the same subscription
+        Assignment.objects.create(job=self.job1, member=self.member3, amount=1)
+        self.assertGet(reverse('home'))
+        self.assertEqual(menu_cache_stats()['misses'], 2)
+        self.job1.multiplier = 2
+        self.job1.save()
+        self.assertGet(reverse('home'))
+        self.assertEqual(menu_cache_stats()['misses'], 3)
+        self.member3.subscription = None
+        self.member3.save()
+        self.assertGet(reverse('home'))
+        self.assertEqual(menu_cache_stats()['misses'], 4)
+        self.job3.multiplier = 2
+        self.job3.save()
+        self.assertGet(reverse('home'))
+        self.assertEqual(menu_cache_stats()['misses'], 4)
+
+    def testAssignmentAmounts(self):
+        job = RecuringJob.objects.create(slots=3, time=timezone.now() - timezone.timedelta(minutes=1), type=self.job_type)
+        Assignment.objects.create(job=job, member=self.member, amount=1)
+        Assignment.objects.create(job=job, member=self.member3, amount=2)
+        Assignment.objects.create(job=job, member=self.member2, amount=1)
+        amounts = AssignmentDao.assignment_amounts_for_member_and_partners_current_business_year(self.member)
+        self.assertEqual({a['member']: a['amount_sum'] for a in amounts}, {self.member.pk: 1, self.member3.pk: 2})
+
+    def testMenuCacheStatsCommand(self):
+        cache.clear()
+        self.assertGet(reverse('home'))
+        self.assertGet(reverse('home'))
+        out = StringIO()
+        err = StringIO()
+        call_command('menu_cache_stats', '--reset', stdout=out, stderr=err)
+        self.assertEqual(out.getvalue(), 'hits: 1, misses: 1, hit rate: 50.0%\n')
+        self.assertIn('not shared', err.getvalue())
+        self.assertEqual(menu_cache_stats()['misses'], 0)
+
+    def testLocalMemoryCacheWarning(self):
+        menu._backend_checked = False
+        with self.assertLogs('juntagrico.menu', 'WARNING'):
+            self.assertGet(reverse('home'))
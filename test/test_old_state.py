@@ -0,0 +1,23 @@
+from juntagrico.entity.depot import Depot
+from juntagrico.entity.jobs import RecuringJob
+from juntagrico.entity.member import Member
+from test.util.test import JuntagricoTestCase
+
+
+class OldStateTests(JuntagricoTestCase):
+
+    def testOnlyTrackedFields(self):
+        member = Member.objects.get(pk=self.member.pk)
+        self.assertEqual(member._old, {'canceled': False, 'inactive': False, 'subscription_id': self.sub.pk})
+        job = RecuringJob.objects.get(pk=self.job1.pk)
+        self.assertEqual(set(job._old), {'canceled', 'time'})
+
+    def testUntrackedModel(self):
+        self.assertIsNone(Depot.objects.get(pk=self.depot.pk)._old)
+
+    def testUpdatedOnSave(self):
+        member = Member.objects.get(pk=self.member.pk)
+        member.canceled = True
+        self.assertFalse(member._old['canceled'])
+        member.save()
+        self.assertTrue(member._old['canceled'])
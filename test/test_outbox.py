@@ -0,0 +1,97 @@
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import override_settings
+from django.urls import reverse
+
+from juntagrico.entity.jobs import Assignment
+from juntagrico.entity.mailing import OutboxEmail
+from juntagrico.mailer import EmailSender
+from test.util.test import JuntagricoTestCase
+
+
+class FailingMailer:
+    def send(msg):
+        raise ConnectionError('relay unavailable')
+
+
+@override_settings(DEFAULT_MAILER='juntagrico.util.outboxmailer.Mailer')
+class OutboxTests(JuntagricoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # discard the emails of the test data creation
+        OutboxEmail.objects.all().delete()
+
+    def testEnqueueAndSend(self):
+        with open('test/test_outbox.py') as fp:
+            EmailSender.get_sender('subject', 'body').attach_files([fp]).send_to(['test@mail.org'])
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboxEmail.objects.get().recipients, 'test@mail.org')
+        out = StringIO()
+        call_command('send_outbox', stdout=out)
+        self.assertEqual(out.getvalue(), '1 emails sent, 0 failed\n')
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, 'subject')
+        self.assertEqual(mail.outbox[0].to, ['test@mail.org'])
+        self.assertEqual(mail.outbox[0].attachments[0][0], 'test/test_outbox.py')
+        self.assertFalse(OutboxEmail.objects.exists())
+
+    def testBatches(self):
+        for i in range(5):
+            EmailSender.get_sender('subject', 'body').send_to('test{}@mail.org'.format(i))
+        call_command('send_outbox', '--batch-size', '2', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertFalse(OutboxEmail.objects.exists())
+
+    def testJobSignupOnlyEnqueues(self):
+        self.assertPost(reverse('job', args=[self.job1.pk]), {'jobs': 1}, 302)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertTrue(OutboxEmail.objects.exists())
+
+    # an unreachable smtp server, only the send_outbox command may connect to it
+    @override_settings(EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend', EMAIL_HOST='localhost', EMAIL_PORT=1)
+    def testNoConnectionWhenEnqueuing(self):
+        post_data = {
+            'sender': 'test@mail.org',
+            'subject': 'subject',
+            'recipients': 'test1@mail.org test2@mail.org',
+        }
+        self.assertPost(reverse('mail-send'), post_data, code=302)
+        self.assertTrue(OutboxEmail.objects.filter(subject='subject').exists())
+
+    @override_settings(EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend', EMAIL_HOST='localhost', EMAIL_PORT=1)
+    def testRemindersWithoutConnection(self):
+        Assignment.objects.create(job=self.job1, member=self.member, amount=1)
+        call_command('remind_members', stdout=StringIO())
+        self.assertEqual(OutboxEmail.objects.filter(subject__contains='Einsatz-Erinnerung').count(), 2)
+
+    @override_settings(OUTBOX_MAILER='test.test_outbox.FailingMailer')
+    def testRetry(self):
+        EmailSender.get_sender('subject', 'body').send_to('test@mail.org')
+        with self.assertLogs('juntagrico.mailer', 'WARNING'):
+            for i in range(3):
+                call_command('send_outbox', '--max-attempts', '2', '--retry-delay', '0', stdout=StringIO())
+        outbox_email = OutboxEmail.objects.get()
+        self.assertEqual(outbox_email.attempts, 2)
+        self.assertTrue(outbox_email.failed)
+        self.assertEqual(outbox_email.last_error, 'relay unavailable')
+        EmailSender.get_sender('subject', 'body').send_to('test@mail.org')
+        with self.assertLogs('juntagrico.mailer', 'WARNING'):
+            call_command('send_outbox', stdout=StringIO())
+            call_command('send_outbox', stdout=StringIO())
+        outbox_email = OutboxEmail.objects.get(failed=False)
+        self.assertEqual(outbox_email.attempts, 1)
+        self.assertGreater(outbox_email.next_attempt, outbox_email.created)
+
+    def testLockWithoutSkipLocked(self):
+        EmailSender.get_sender('subject', 'body').send_to('test@mail.org')
+        with mock.patch.object(connection.features, 'has_select_for_update_skip_locked', False), \
+                mock.patch.object(QuerySet, 'select_for_update', autospec=True, side_effect=lambda qs, **kwargs: qs) as select_for_update:
+            call_command('send_outbox', stdout=StringIO())
+        select_for_update.assert_called_once_with(mock.ANY, skip_locked=False)
+        self.assertEqual(len(mail.outbox), 1)
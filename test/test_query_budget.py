@@ -0,0 +1,132 @@
+import json
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.template.base import Template
+from django.urls import reverse
+from django.utils import timezone
+
+from juntagrico.entity.jobs import Assignment, RecuringJob
+from juntagrico.entity.subs import Subscription
+from juntagrico.entity.subtypes import TFSST, TSST
+from juntagrico.util.pdf import save_pdf_storage
+from juntagrico.util.profiling import RequestProfile
+from test.util.test import JuntagricoTestCase
+
+
+class QueryBudgetTests(JuntagricoTestCase):
+    '''
+    the budgets are the number of queries of the views with a cold menu cache.
+    they must not grow with the amount of data shown, so raising them needs a good reason
+    '''
+
+    def add_subscriptions(self, count):
+        '''
+        active subscriptions with one member each, changing their type and with an assignment
+        '''
+        for i in range(count):
+            member = self.create_member('budget{}@email.org'.format(Subscription.objects.count()))
+            subscription = Subscription.objects.create(depot=self.depot, active=True, activation_date='2017-03-27',
+                                                       creation_date='2017-03-27', start_date='2018-01-01')
+            member.subscription = subscription
+            member.save()
+            subscription.primary_member = member
+            subscription.save()
+            TSST.objects.create(subscription=subscription, type=self.sub_type)
+            TFSST.objects.create(subscription=subscription, type=self.sub_type2)
+            Assignment.objects.create(job=self.job4, member=member, amount=1)
+
+    def add_jobs(self, count):
+        for i in range(count):
+            job = RecuringJob.objects.create(slots=2, time=timezone.now() + timezone.timedelta(days=1), type=self.job_type)
+            Assignment.objects.create(job=job, member=self.member2, amount=1)
+
+    def assertFlatQueries(self, url, add_rows, member=None):
+        '''
+        assert that the number of queries of the view does not grow when more rows are added
+        '''
+        add_rows(1)
+        queries = self.assertQueryBudget(url, 1000, member=member).query_count
+        add_rows(4)
+        self.assertQueryBudget(url, queries, member=member)
+
+    def testHome(self):
+        self.assertQueryBudget(reverse('home'), 29)
+
+    def testJob(self):
+        self.assertQueryBudget(reverse('job', args=[self.job1.pk]), 28)
+
+    def testJobParticipants(self):
+        url = reverse('job', args=[self.job4.pk])
+        Assignment.objects.create(job=self.job4, member=self.member, amount=1)
+        queries = self.assertQueryBudget(url, 29).query_count
+        for i in range(5):
+            member = self.create_member('participant{}@email.org'.format(i))
+            for j in range(i % 2 + 1):
+                assignment = Assignment.objects.create(job=self.job4, member=member, amount=1)
+                assignment.job_extras.add(self.job_extra)
+        self.assertQueryBudget(url, queries)
+
+    def testJobs(self):
+        self.assertQueryBudget(reverse('jobs'), 25)
+
+    def testFilters(self):
+        self.assertQueryBudget(reverse('filters'), 26, member=self.admin)
+
+    def testSubscriptions(self):
+        self.assertQueryBudget(reverse('filter-subs'), 24)
+
+    def testFuture(self):
+        self.assertQueryBudget(reverse('future'), 25)
+
+    def testTypeChangeList(self):
+        self.assertQueryBudget(reverse('sub-mgmt-changelist'), 21)
+
+    def testJobsGrowth(self):
+        self.assertFlatQueries(reverse('jobs'), self.add_jobs)
+
+    def testAllJobsDataGrowth(self):
+        self.assertFlatQueries(reverse('jobs-all-data'), self.add_jobs)
+
+    def testSubscriptionsGrowth(self):
+        self.assertFlatQueries(reverse('filter-subs'), self.add_subscriptions)
+
+    def testFutureGrowth(self):
+        self.assertFlatQueries(reverse('future'), self.add_subscriptions)
+
+    def testTypeChangeListGrowth(self):
+        self.assertFlatQueries(reverse('sub-mgmt-changelist'), self.add_subscriptions)
+
+    def testDepotlist(self):
+        save_pdf_storage(b'%PDF-1.4', 'depotlist.pdf')
+        self.addCleanup(default_storage.delete, 'depotlist.pdf')
+        self.assertQueryBudget(reverse('lists-depotlist'), 4)
+
+
+class QueryProfileMiddlewareTests(JuntagricoTestCase):
+
+    def testProfileExport(self):
+        middleware = ['juntagrico.util.profiling.QueryProfileMiddleware'] + settings.MIDDLEWARE
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'profile.json')
+            with self.settings(MIDDLEWARE=middleware, QUERY_PROFILE_FILE=filename):
+                with self.assertLogs('juntagrico.profiling', 'INFO') as logs:
+                    self.assertGet(reverse('jobs'))
+            with open(filename) as profile_file:
+                record = json.loads(profile_file.readline())
+        self.assertIn('/my/jobs', logs.output[0])
+        self.assertEqual(record['view'], 'jobs')
+        self.assertEqual(record['status'], 200)
+        self.assertGreater(record['queries'], 0)
+        self.assertGreater(record['template_time'], 0)
+
+    def testTemplatesRestored(self):
+        render = Template.render
+        with RequestProfile():
+            self.assertIsNot(Template.render, render)
+            with RequestProfile():
+                pass
+            self.assertIsNot(Template.render, render)
+        self.assertIs(Template.render, render)
@@ -1,7 +1,14 @@
 from django.core.exceptions import ValidationError
+from django.db.models import signals
 from django.urls import reverse
 
+from juntagrico.dao.subscriptiondao import SubscriptionDao
+from juntagrico.entity.extrasubs import ExtraSubscription
+from juntagrico.entity.member import Member
 from juntagrico.entity.share import Share
+from juntagrico.entity.subs import Subscription
+from juntagrico.entity.subtypes import TFSST, TSST
+from juntagrico.util import management
 from test.util.test import JuntagricoTestCase
 
 
@@ -17,6 +24,55 @@ class SubscriptionTests(JuntagricoTestCase):
         self.assertIsNone(self.member2.future_subscription)
         self.assertEqual(self.member2.subscription, self.sub2)
 
+    def testSubsActivation(self):
+        self.assertPost(reverse('subs-activate'), {'subscriptions': [self.sub.pk, self.sub2.pk]}, 302)
+        self.sub2.refresh_from_db()
+        self.assertTrue(self.sub2.active)
+        self.member2.refresh_from_db()
+        self.assertIsNone(self.member2.future_subscription)
+        self.assertEqual(self.member2.subscription, self.sub2)
+
+    def testSubsInvalidIds(self):
+        for url in [reverse('subs-activate'), reverse('subs-deactivate')]:
+            self.assertPost(url, {'subscriptions': [self.sub2.pk, 'x']}, 400)
+        self.sub2.refresh_from_db()
+        self.assertFalse(self.sub2.active)
+
+    def testSubsActivationError(self):
+        self.member2.subscription = self.sub
+        self.member2.save()
+        self.assertPost(reverse('subs-activate'), {'subscriptions': [self.sub2.pk]})
+        self.sub2.refresh_from_db()
+        self.assertFalse(self.sub2.active)
+
+    def testSubsDeactivation(self):
+        self.assertPost(reverse('subs-deactivate'), {'subscriptions': [self.sub.pk, self.sub2.pk]}, 302)
+        self.sub.refresh_from_db()
+        self.assertFalse(self.sub.active)
+        self.assertIsNotNone(self.sub.deactivation_date)
+        self.member.refresh_from_db()
+        self.member3.refresh_from_db()
+        self.assertIsNone(self.member.subscription)
+        self.assertIn(self.sub, self.member.old_subscriptions.all())
+        self.assertIn(self.sub, self.member3.old_subscriptions.all())
+        self.assertFalse(self.member.inactive)
+        self.assertTrue(self.member3.inactive)
+
+    def testSubsActivationSavesMembers(self):
+        saved = []
+
+        def member_saved(sender, instance, **kwargs):
+            saved.append(instance.pk)
+        signals.post_save.connect(member_saved, sender=Member)
+        try:
+            management.activate_subscriptions([self.sub2.pk])
+            self.assertEqual(saved, [self.member2.pk])
+            saved.clear()
+            management.deactivate_subscriptions([self.sub.pk])
+            self.assertEqual(sorted(saved), sorted([self.member.pk, self.member3.pk]))
+        finally:
+            signals.post_save.disconnect(member_saved, sender=Member)
+
     def testSubChange(self):
         self.assertGet(reverse('sub-change', args=[self.sub.pk]))
 
@@ -88,3 +144,48 @@ class SubscriptionTests(JuntagricoTestCase):
         self.assertGet(reverse('sub-activate', args=[self.sub2.pk]), 302)
         self.sub2.refresh_from_db()
         self.assertFalse(self.sub2.active)
+
+    def testTypeTotals(self):
+        sub = Subscription.objects.get(pk=self.sub.pk)
+        with self.assertNumQueries(1):
+            self.assertEqual(sub.required_shares, 1)
+            self.assertEqual(sub.required_assignments, 10)
+            self.assertEqual(sub.required_core_assignments, 0)
+            self.assertEqual(sub.price, 1000)
+            self.assertEqual(sub.size, 'product:1.0')
+            self.assertIn('sub_type_name', sub.size_name)
+        TSST.objects.create(subscription=sub, type=self.sub_type2)
+        self.assertEqual(sub.required_shares, 3)
+        self.assertEqual(sub.size, 'product:2.0')
+
+    def testAnnotatedTypeTotals(self):
+        TSST.objects.create(subscription=self.sub, type=self.sub_type2)
+        subs = SubscriptionDao.annotate_type_totals(Subscription.objects.order_by('pk'))
+        with self.assertNumQueries(1):
+            totals = [(sub.required_shares, sub.required_assignments, sub.price) for sub in subs]
+        self.assertEqual(totals, [(3, 20, 2000), (0, 0, 0)])
+
+    def testFuture(self):
+        TFSST.objects.create(subscription=self.sub, type=self.sub_type2)
+        TFSST.objects.create(subscription=self.sub2, type=self.sub_type2)
+        ExtraSubscription.objects.create(main_subscription=self.sub, type=self.esub_type, active=True)
+        ExtraSubscription.objects.create(main_subscription=self.sub, type=self.esub_type)
+        response = self.assertGet(reverse('future'))
+        self.assertEqual(response.context['subscription_lines'], [{'name': 'product-sub_name', 'now': 1, 'future': 3}])
+        self.assertEqual(response.context['extra_lines'], [{'name': 'Extrasub_Type', 'now': 1, 'future': 2}])
+
+    def testSubscriptionsWithChangedTypes(self):
+        def changed():
+            return list(SubscriptionDao.subscriptions_with_changed_types(Subscription.objects.all()))
+        self.assertEqual(changed(), [])
+        TFSST.objects.create(subscription=self.sub, type=self.sub_type)
+        self.assertEqual(changed(), [self.sub])
+        TSST.objects.create(subscription=self.sub, type=self.sub_type)
+        self.assertEqual(changed(), [])
+        TSST.objects.create(subscription=self.sub2, type=self.sub_type2)
+        self.assertEqual(changed(), [self.sub2])
+        self.assertEqual(changed(), [sub for sub in Subscription.objects.order_by('pk') if sub.types_changed])
+        TFSST.objects.create(subscription=self.sub, type=self.sub_type2)
+        # only the active subscription is listed
+        response = self.assertGet(reverse('sub-mgmt-changelist'))
+        self.assertEqual(list(response.context['management_list']), [self.sub])
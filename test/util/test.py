@@ -9,6 +9,7 @@ from juntagrico.entity.member import Member
 from juntagrico.entity.share import Share
 from juntagrico.entity.subs import Subscription
 from juntagrico.entity.subtypes import SubscriptionProduct, SubscriptionSize, SubscriptionType, TSST, TFSST
+from juntagrico.util.profiling import RequestProfile
 
 
 @override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
@@ -263,9 +264,24 @@ class JuntagricoTestCase(TestCase):
         self.client.force_login(login_member.user)
         response = self.client.get(url)
         self.assertEqual(response.status_code, code)
+        return response
 
     def assertPost(self, url, data=None, code=200, member=None):
         login_member = member or self.member
         self.client.force_login(login_member.user)
         response = self.client.post(url, data)
         self.assertEqual(response.status_code, code)
+        return response
+
+    def assertQueryBudget(self, url, budget, code=200, member=None):
+        """
+        request the url and assert that it issues at most budget queries
+        """
+        login_member = member or self.member
+        self.client.force_login(login_member.user)
+        with RequestProfile() as profile:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, code)
+        self.assertLessEqual(profile.query_count, budget, '{} issued {} queries:\n{}'.format(
+            url, profile.query_count, '\n'.join(profile.queries)))
+        return profile